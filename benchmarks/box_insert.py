@@ -0,0 +1,67 @@
+"""
+Benchmark inserting rows at random positions into a Gtk.Box.
+
+Compares the positional `insert_widget` dispatcher, which walks the children
+from the first one to find its anchor, with `ReactiveSequence`, which finds
+the anchor in its ordered widget list.
+
+Requires GTK 4 and a display.
+
+Usage:
+    python benchmarks/box_insert.py [--rows 10000] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+
+from gi.repository import Gtk  # type: ignore # noqa: E402
+
+from impressive_ui.gtk import ReactiveList, ReactiveSequence  # noqa: E402
+from impressive_ui.reactive_sequence import insert_widget  # noqa: E402
+
+
+def positions(rows: int, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.randint(0, i) for i in range(rows)]
+
+
+def bench_insert_widget(rows: int, seed: int) -> float:
+    box = Gtk.Box()
+    labels = [Gtk.Label(label=str(i)) for i in range(rows)]
+    start = time.perf_counter()
+    for label, position in zip(labels, positions(rows, seed)):
+        insert_widget(box, label, position)
+    return time.perf_counter() - start
+
+
+def bench_reactive_sequence(rows: int, seed: int) -> float:
+    items = ReactiveList[int]()
+    ReactiveSequence(Gtk.Box(), items, lambda i: Gtk.Label(label=str(i)))
+    start = time.perf_counter()
+    for i, position in enumerate(positions(rows, seed)):
+        items.insert(position, i)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'method':<20} {'rows':>8} {'time (ms)':>10}")
+    for name, bench in (
+        ("insert_widget", bench_insert_widget),
+        ("ReactiveSequence", bench_reactive_sequence),
+    ):
+        elapsed = bench(args.rows, args.seed)
+        print(f"{name:<20} {args.rows:>8} {elapsed * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark the keyed diff engine and guard it against regressions.
+
+Each workload turns a list of integer keys into a new list:
+
+- append: one key is added at the back
+- prepend: one key is added at the front
+- reverse: the list is reversed
+- shuffle: the list is randomly reordered
+- single-move: one key is moved from the front to the back
+- bulk-delete: every fourth key is removed
+
+For every workload and size, the plan of `compute_diff_plan` is timed and
+its peak memory is traced, and the operations it emits are counted, both one
+per key and coalesced into ranges. Up to `--verify-limit` keys, the plan is
+also applied to a plain list, as in the `diff_update` doctests, to check
+that it produces the new list. No GTK is needed.
+
+Results can be saved with `--save` and compared with `--compare`. The run
+fails when a plan emits more operations than the saved one, or when it takes
+longer than the saved time by more than `--time-tolerance` and a millisecond.
+
+Usage:
+    python benchmarks/diff_engine.py [--sizes 10 100 1000 10000 100000]
+        [--repeat 3] [--save results.json] [--compare results.json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+
+from impressive_ui.reactive_sequence import compute_diff_plan, iter_apply_diff_plan
+
+
+def append(n: int) -> tuple[list[int], list[int]]:
+    return list(range(n)), [*range(n), n]
+
+
+def prepend(n: int) -> tuple[list[int], list[int]]:
+    return list(range(n)), [n, *range(n)]
+
+
+def reverse(n: int) -> tuple[list[int], list[int]]:
+    return list(range(n)), list(reversed(range(n)))
+
+
+def shuffle(n: int) -> tuple[list[int], list[int]]:
+    new = list(range(n))
+    random.Random(n).shuffle(new)
+    return list(range(n)), new
+
+
+def single_move(n: int) -> tuple[list[int], list[int]]:
+    return list(range(n)), [*range(1, n), 0]
+
+
+def bulk_delete(n: int) -> tuple[list[int], list[int]]:
+    return list(range(n)), [key for key in range(n) if key % 4]
+
+
+WORKLOADS: dict[str, Callable[[int], tuple[list[int], list[int]]]] = {
+    "append": append,
+    "prepend": prepend,
+    "reverse": reverse,
+    "shuffle": shuffle,
+    "single-move": single_move,
+    "bulk-delete": bulk_delete,
+}
+
+# Timings below a millisecond are mostly noise, so they may always differ by
+# this many seconds
+TIME_SLACK = 0.001
+
+
+def measure_time(old: Sequence[int], new: Sequence[int], repeat: int) -> float:
+    """Return the best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compute_diff_plan(old, new)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_memory(old: Sequence[int], new: Sequence[int]) -> int:
+    """Return the peak memory in bytes allocated while computing a plan."""
+    tracemalloc.start()
+    try:
+        compute_diff_plan(old, new)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def verify(old: Sequence[int], new: Sequence[int]) -> bool:
+    """Apply the plan to a plain list and check that it yields the new list."""
+    container = list(old)
+    for _ in iter_apply_diff_plan(
+        container,
+        compute_diff_plan(old, new, coalesce=True),
+        old,
+        new,
+        lambda key, _item: key,
+        lambda container, item: container.remove(item),
+        lambda container, item, index: container.insert(index, item),
+        lambda container: container,
+    ):
+        pass
+    return container == new
+
+
+def run(sizes: Sequence[int], repeat: int, verify_limit: int) -> dict[str, dict]:
+    """Benchmark every workload at every size and print one row each."""
+    results = {}
+    print(
+        f"{'workload':<12} {'size':>8} {'time (ms)':>10} {'peak (KiB)':>11}"
+        f" {'ops':>8} {'ranges':>7} {'verified':>9}"
+    )
+    for name, workload in WORKLOADS.items():
+        for size in sizes:
+            old, new = workload(size)
+            result = {
+                "time": measure_time(old, new, repeat),
+                "peak": measure_memory(old, new),
+                "operations": len(compute_diff_plan(old, new).operations),
+                "ranges": len(compute_diff_plan(old, new, coalesce=True).operations),
+            }
+            verified = "-"
+            if size <= verify_limit:
+                verified = "yes" if verify(old, new) else "NO"
+                result["verified"] = verified == "yes"
+            results[f"{name}/{size}"] = result
+            print(
+                f"{name:<12} {size:>8} {result['time'] * 1000:>10.2f}"
+                f" {result['peak'] / 1024:>11.1f} {result['operations']:>8}"
+                f" {result['ranges']:>7} {verified:>9}"
+            )
+    return results
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], time_tolerance: float
+) -> list[str]:
+    """List the regressions of `results` against a saved baseline."""
+    regressions = []
+    for case, result in results.items():
+        if not result.get("verified", True):
+            regressions.append(f"{case}: plan does not produce the new list")
+        if case not in baseline:
+            continue
+        saved = baseline[case]
+        for count in ("operations", "ranges"):
+            if result[count] > saved[count]:
+                regressions.append(
+                    f"{case}: {result[count]} {count}, was {saved[count]}"
+                )
+        if result["time"] > saved["time"] * (1 + time_tolerance) + TIME_SLACK:
+            regressions.append(
+                f"{case}: {result['time'] * 1000:.2f} ms,"
+                f" was {saved['time'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--verify-limit", type=int, default=10_000)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.verify_limit)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    regressions = compare(results, baseline, args.time_tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the longest increasing subsequence used by the keyed diff engine.
+
+The input of the LIS is the list of old positions of the keys that survive an
+update, in their new order. Each workload below produces that list directly:
+
+- shuffle: the sequence is randomly reordered
+- reverse: the sequence is reversed
+- single-move: one item is moved from the front to the back
+
+Usage:
+    python benchmarks/lis.py [--sizes 100 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable, Sequence
+
+from impressive_ui.reactive_sequence.diff import longest_increasing_subsequence_indices
+
+
+def shuffle(n: int) -> list[int]:
+    positions = list(range(n))
+    random.Random(n).shuffle(positions)
+    return positions
+
+
+def reverse(n: int) -> list[int]:
+    return list(reversed(range(n)))
+
+
+def single_move(n: int) -> list[int]:
+    return [*range(1, n), 0]
+
+
+WORKLOADS: dict[str, Callable[[int], list[int]]] = {
+    "shuffle": shuffle,
+    "reverse": reverse,
+    "single-move": single_move,
+}
+
+
+def measure(arr: Sequence[int], repeat: int) -> float:
+    """Return the best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        longest_increasing_subsequence_indices(arr)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'workload':<12} {'size':>8} {'time (ms)':>10} {'lis':>8}")
+    for name, workload in WORKLOADS.items():
+        for size in args.sizes:
+            arr = workload(size)
+            elapsed = measure(arr, args.repeat)
+            lis_length = len(longest_increasing_subsequence_indices(arr))
+            print(f"{name:<12} {size:>8} {elapsed * 1000:>10.2f} {lis_length:>8}")
+
+
+if __name__ == "__main__":
+    main()
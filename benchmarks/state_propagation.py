@@ -0,0 +1,95 @@
+"""
+Benchmark how fast a change propagates through a graph of states.
+
+Uses the toolkit-independent states of `impressive_ui.core` with the
+immediate scheduler, so no GTK or Qt is needed:
+
+- chain: each state maps the previous one
+- fan-out: every state maps the same source
+- diamond: two maps of the source are combined into one state
+
+Each workload sets the source a number of times and reports the time per
+set, how many watcher callbacks ran and how many scheduler hops the
+dependency graph saved, per set. A glitch-free diamond runs one callback
+per sink.
+
+Usage:
+    python benchmarks/state_propagation.py [--sizes 10 100 1000] [--sets 1000]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from impressive_ui.core import MutableState, State, combine, dependency_graph
+
+
+def chain(source: MutableState[int], size: int) -> list[State[int]]:
+    states: list[State[int]] = [source]
+    for _ in range(size):
+        states.append(states[-1].map(lambda x: x + 1))
+    return states[1:]
+
+
+def fan_out(source: MutableState[int], size: int) -> list[State[int]]:
+    return [source.map(lambda x, i=i: x + i) for i in range(size)]
+
+
+def diamond(source: MutableState[int], size: int) -> list[State[int]]:
+    sinks = []
+    for i in range(size):
+        left = source.map(lambda x: x + 1)
+        right = source.map(lambda x, i=i: x * i)
+        sinks.append(combine(lambda a, b: a + b, left, right))
+    return sinks
+
+
+WORKLOADS: dict[str, Callable[[MutableState[int], int], list[State[int]]]] = {
+    "chain": chain,
+    "fan-out": fan_out,
+    "diamond": diamond,
+}
+
+
+def measure(workload, size: int, sets: int) -> tuple[float, int, int]:
+    """Return the time per set in seconds, and the callbacks and hops saved."""
+    source = MutableState(0)
+    calls = 0
+
+    def count(_value: int) -> None:
+        nonlocal calls
+        calls += 1
+
+    for state in workload(source, size):
+        state.watch(count)
+    calls = 0
+    dependency_graph.reset_stats()
+
+    start = time.perf_counter()
+    for value in range(1, sets + 1):
+        source.set(value)
+    elapsed = time.perf_counter() - start
+    return elapsed / sets, calls // sets, dependency_graph.hops_saved // sets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000])
+    parser.add_argument("--sets", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'workload':<10} {'size':>8} {'time/set (us)':>14} {'callbacks':>10}"
+        f" {'hops saved':>11}"
+    )
+    for name, workload in WORKLOADS.items():
+        for size in args.sizes:
+            elapsed, calls, hops_saved = measure(workload, size, args.sets)
+            print(
+                f"{name:<10} {size:>8} {elapsed * 1e6:>14.2f} {calls:>10}"
+                f" {hops_saved:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import gi
 
 from impressive_ui.gtk import (
     MutableState,
+    ReactiveList,
     State,
     Conditional,
     ReactiveSequence,
@@ -104,7 +105,7 @@ def TaskList(
 
 class TodoViewModel:
     def __init__(self):
-        self._tasks = MutableState[Sequence[TaskViewModel]]([])
+        self._tasks = ReactiveList[TaskViewModel]()
         self._entry_text = MutableState("")
         self._stats = MutableState[tuple[int, int]]((0, 0))
 
@@ -143,11 +144,11 @@ class TodoViewModel:
         def _(_):
             self.update_stats()
 
-        self._tasks.update(lambda ts: [*ts, new_task])
+        self._tasks.append(new_task)
         self._entry_text.set("")
 
     def remove_task(self, task: TaskViewModel):
-        self._tasks.update(lambda ts: [t for t in ts if t is not task])
+        self._tasks.remove(task)
 
     def set_entry_text(self, text: str) -> None:
         self._entry_text.set(text)
@@ -0,0 +1,20 @@
+from .graph import DependencyGraph, dependency_graph
+from .scheduler import (
+    AsyncioScheduler,
+    ImmediateScheduler,
+    Scheduler,
+    WriteBatch,
+)
+from .state import MutableState, State, combine
+
+__all__ = [
+    "AsyncioScheduler",
+    "DependencyGraph",
+    "ImmediateScheduler",
+    "MutableState",
+    "Scheduler",
+    "State",
+    "WriteBatch",
+    "combine",
+    "dependency_graph",
+]
@@ -0,0 +1,108 @@
+import heapq
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .state import State
+
+
+class DependencyGraph:
+    """
+    Recompute derived states in one pass, lowest first.
+
+    Every derived state has a height, one more than the highest state it is
+    computed from. When states change, their dependents are marked dirty and
+    recomputed in order of height, so a state is only recomputed after all
+    of its sources, and at most once per pass. Watchers therefore never see
+    a derived value computed from a mix of old and new values, such as the
+    sum of two maps of one source where only one map has been updated.
+
+    A change made outside `batch` schedules one pass through the scheduler
+    of the changed state. Changes made inside it are propagated when the
+    outermost batch ends, even if it ends with an error. A state that fails
+    to recompute keeps its value, and the first error is raised once every
+    other dirty state is recomputed.
+
+    >>> from impressive_ui.core import MutableState
+    >>> count, values = MutableState(1), []
+    >>> unwatch = count.map(lambda x: 1 / (x - 2)).watch(lambda _: None)
+    >>> unwatch = count.map(lambda x: x * 10).watch(values.append)
+    >>> count.set(2)
+    Traceback (most recent call last):
+    ...
+    ZeroDivisionError: division by zero
+    >>> values
+    [10, 20]
+
+    `hops_saved` counts the scheduler calls avoided compared to pushing the
+    new value of every dependency to its dependent with a scheduled `set`,
+    and `recomputations` counts the derived values computed.
+    """
+
+    def __init__(self) -> None:
+        self._dirty: list[tuple[int, int, State[Any]]] = []
+        self._queued: set[State[Any]] = set()
+        self._depth = 0
+        self._scheduled = False
+        self.hops_saved = 0
+        self.recomputations = 0
+
+    def reset_stats(self) -> None:
+        self.hops_saved = 0
+        self.recomputations = 0
+
+    def changed(self, state: "State[Any]") -> None:
+        """Mark the dependents of `state` dirty and arrange for a pass."""
+        dependents = state._dependents
+        if not dependents:
+            return
+        self.hops_saved += len(dependents)
+        queued = self._queued
+        for dependent in dependents:
+            if dependent not in queued:
+                queued.add(dependent)
+                # States of equal height are independent, so any order will do
+                heapq.heappush(
+                    self._dirty, (dependent._height, id(dependent), dependent)
+                )
+        if self._depth or self._scheduled:
+            return
+        self._scheduled = True
+        self.hops_saved -= 1
+        state._scheduler.call_soon(self.flush)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Propagate the changes made in the block together when it ends."""
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.flush()
+
+    def flush(self) -> None:
+        """Recompute every dirty state, lowest first."""
+        self._scheduled = False
+        self._depth += 1
+        errors = []
+        try:
+            dirty, queued = self._dirty, self._queued
+            while dirty:
+                state = heapq.heappop(dirty)[2]
+                queued.discard(state)
+                self.recomputations += 1
+                try:
+                    state._recompute()
+                except Exception as error:  # noqa: BLE001
+                    errors.append(error)
+        finally:
+            self._depth -= 1
+        if errors:
+            raise errors[0]
+
+
+# The graph of all states, which are only changed on the thread that owns them
+dependency_graph = DependencyGraph()
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from typing import Any, Protocol, TypeVar, runtime_checkable
+
+from .graph import dependency_graph
+
+T = TypeVar("T")
+
+
+@runtime_checkable
+class Scheduler(Protocol):
+    def call_soon(self, callback: Callable[[], Any]) -> None:
+        """
+        Arrange for `callback` to be called on the thread that owns the states.
+
+        May be called from any thread.
+        """
+        ...
+
+
+class ImmediateScheduler:
+    """
+    Call every callback before returning, on the calling thread.
+
+    Callbacks scheduled while another one runs are queued and called after
+    it, so a long chain of states does not recurse once per state. Suited to
+    tests and benchmarks, where no event loop is running, on a single thread.
+
+    >>> scheduler = ImmediateScheduler()
+    >>> scheduler.call_soon(lambda: (scheduler.call_soon(lambda: print(2)), print(1)))
+    1
+    2
+    """
+
+    def __init__(self) -> None:
+        self._queue: deque[Callable[[], Any]] = deque()
+
+    def call_soon(self, callback: Callable[[], Any]) -> None:
+        self._queue.append(callback)
+        if len(self._queue) > 1:
+            return  # Called by the callback that is running
+        try:
+            while self._queue:
+                self._queue[0]()
+                self._queue.popleft()
+        except BaseException:
+            self._queue.clear()
+            raise
+
+
+class AsyncioScheduler:
+    """Call callbacks on an asyncio event loop, from any thread."""
+
+    def __init__(self, event_loop: asyncio.AbstractEventLoop) -> None:
+        self._event_loop = event_loop
+
+    def call_soon(self, callback: Callable[[], Any]) -> None:
+        self._event_loop.call_soon_threadsafe(callback)
+
+
+class WriteBatch:
+    """
+    Coalesce the writes to many states into one call per scheduler turn.
+
+    Each `write` replaces any pending write to the same state, and the first
+    pending write schedules a single `flush` that applies the latest value of
+    every written state, in the order they were first written, and then
+    recomputes the states derived from them in a single pass. Writes may
+    come from any thread. A write that raises does not stop the others, and
+    the first error is raised once every write is applied.
+
+    >>> batch = WriteBatch(ImmediateScheduler())
+    >>> batch.write('a', print, 1)
+    1
+
+    >>> from types import SimpleNamespace
+    >>> def fail(value):
+    ...     raise ValueError(value)
+    >>> later, applied = [], []
+    >>> batch = WriteBatch(SimpleNamespace(call_soon=later.append))
+    >>> batch.write('a', fail, 1)
+    >>> batch.write('b', applied.append, 2)
+    >>> later.pop()()
+    Traceback (most recent call last):
+    ...
+    ValueError: 1
+    >>> applied
+    [2]
+    """
+
+    def __init__(self, scheduler: Scheduler) -> None:
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, tuple[Callable[[Any], Any], Any]] = {}
+        self._scheduled = False
+
+    def write(self, state: Hashable, apply: Callable[[T], Any], value: T) -> None:
+        """Apply `value` with `apply` on the next flush, unless overwritten."""
+        with self._lock:
+            self._pending[state] = (apply, value)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._scheduler.call_soon(self.flush)
+
+    def pending(self, state: Hashable, default: T) -> T:
+        """Get the value of the pending write to `state`, or `default`."""
+        with self._lock:
+            write = self._pending.get(state)
+        return default if write is None else write[1]
+
+    def take(self, state: Hashable) -> tuple[Callable[[Any], Any], Any] | None:
+        """Remove the pending write to `state` and return it, if there is one."""
+        with self._lock:
+            return self._pending.pop(state, None)
+
+    def flush(self) -> None:
+        """Apply every pending write. Writes made meanwhile wait for the next."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        errors = []
+        # Derived states are recomputed once for all the written states
+        with dependency_graph.batch():
+            for apply, value in pending.values():
+                try:
+                    apply(value)
+                except Exception as error:  # noqa: BLE001
+                    errors.append(error)
+        if errors:
+            raise errors[0]
@@ -0,0 +1,165 @@
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from .graph import dependency_graph
+from .scheduler import ImmediateScheduler, Scheduler
+
+if TYPE_CHECKING:
+    from impressive_ui.abc.state import (
+        check_mutable_state_impl,
+        check_state_impl,
+    )
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+# States created without a scheduler share one, so that a change runs through
+# the whole graph without recursing into every derived state
+_immediate = ImmediateScheduler()
+
+
+class State(Generic[T]):
+    """
+    A value that notifies its watchers whenever it is assigned.
+
+    This is the toolkit-independent implementation of `AbstractState` that
+    the GTK and Qt states build on. New values of mutable and derived states
+    are delivered through `scheduler`, an `ImmediateScheduler` unless
+    another one is given, so a graph of states can be run and measured
+    without a toolkit.
+
+    Derived states are lazy: they only follow their sources while they are
+    observed by a watcher, a binding or an observed derived state. Reading
+    an unobserved derived state computes its value on the spot.
+
+    >>> count = MutableState(1)
+    >>> doubled = count.map(lambda x: x * 2)
+    >>> unwatch = doubled.watch(print)
+    2
+    >>> count.set(5)
+    10
+    """
+
+    def __init__(self, initial_value: T, scheduler: Scheduler | None = None) -> None:
+        self._value = initial_value
+        self._scheduler = scheduler or _immediate
+        self._callbacks: list[Callable[[T], Any]] = []
+        # Derived states know how to recompute themselves from their sources
+        self._sources: tuple[State[Any], ...] = ()
+        self._compute: Callable[..., T] | None = None
+        self._height = 0
+        self._dependents: list[State[Any]] = []
+        self._observers = 0
+
+    @property
+    def value(self) -> T:
+        """
+        The current state value.
+        This property is used to access the value of the state.
+        """
+        if self._compute is not None and not self._observers:
+            return self._compute(*[source.value for source in self._sources])
+        return self._value
+
+    def get(self) -> T:
+        return self.value
+
+    def watch(self, callback: Callable[[T], Any]) -> Callable[[], None]:
+        self._observe()
+        callback(self._value)  # Call immediately with current value
+        self._callbacks.append(callback)
+
+        def unwatch() -> None:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+                self._unobserve()
+
+        return unwatch
+
+    def _observe(self) -> None:
+        """Count an observer, and follow the sources for the first one."""
+        self._observers += 1
+        if self._observers > 1 or self._compute is None:
+            return
+        for source in self._sources:
+            source._observe()
+            source._dependents.append(self)
+        self._recompute()
+
+    def _unobserve(self) -> None:
+        """Stop counting an observer, and release the sources after the last."""
+        self._observers -= 1
+        if self._observers or self._compute is None:
+            return
+        for source in self._sources:
+            source._dependents.remove(self)
+            source._unobserve()
+
+    def _assign(self, value: T) -> None:
+        """Store a new value and notify every watcher, on the owning thread."""
+        self._value = value
+        for callback in tuple(self._callbacks):
+            callback(value)
+        dependency_graph.changed(self)
+
+    def _derive(self) -> "MutableState[Any]":
+        """
+        Create the state that holds a value derived from this one.
+
+        Its value is computed when it is first read or observed.
+        """
+        return MutableState(None, self._scheduler)
+
+    def _depend_on(
+        self, sources: "tuple[State[Any], ...]", compute: Callable[..., T]
+    ) -> None:
+        """Compute this state from `sources` while it is observed."""
+        self._sources = sources
+        self._compute = compute
+        self._height = max(source._height for source in sources) + 1
+
+    def _recompute(self) -> None:
+        if self._compute is not None:
+            self._assign(self._compute(*[source._value for source in self._sources]))
+
+    def map(self, mapper: Callable[[T], U], /) -> "State[U]":
+        derived = self._derive()
+        derived._depend_on((self,), mapper)
+        return derived
+
+
+if TYPE_CHECKING:
+    check_state_impl(State)
+
+
+class MutableState(State[T]):
+    def set(self, value: T) -> None:
+        self._scheduler.call_soon(lambda: self._assign(value))
+
+    def update(self, updater: Callable[[T], T]) -> None:
+        self.set(updater(self._value))
+
+
+if TYPE_CHECKING:
+    check_mutable_state_impl(MutableState)
+
+
+def combine(compute: Callable[..., U], *sources: State[Any]) -> State[U]:
+    """
+    Create a state computed from the values of several states.
+
+    The new state is recomputed once per change, after all of its sources,
+    even when several of them change together.
+
+    >>> count = MutableState(1)
+    >>> total = combine(
+    ...     lambda a, b: a + b, count.map(lambda x: x + 1), count.map(lambda x: x * 10)
+    ... )
+    >>> unwatch = total.watch(print)
+    12
+    >>> count.set(2)
+    23
+    """
+    derived = sources[0]._derive()
+    derived._depend_on(sources, compute)
+    return derived
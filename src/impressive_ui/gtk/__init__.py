@@ -1,10 +1,13 @@
-from .state import MutableState, State
-from .factory import Conditional, ReactiveSequence, Preview
+from .state import GLibScheduler, MutableState, ReactiveList, State
+from .factory import Conditional, ReactiveSequence, ReactiveListView, Preview
 
 __all__ = [
     "State",
     "MutableState",
+    "ReactiveList",
+    "GLibScheduler",
     "Conditional",
     "ReactiveSequence",
+    "ReactiveListView",
     "Preview",
 ]
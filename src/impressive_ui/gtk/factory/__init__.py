@@ -1,9 +1,11 @@
 from .preview import Preview
 from .conditional import Conditional
 from .reactive_sequence import ReactiveSequence
+from .list_view import ReactiveListView
 
 __all__ = [
     "Preview",
     "Conditional",
     "ReactiveSequence",
+    "ReactiveListView",
 ]
@@ -0,0 +1,152 @@
+from collections.abc import Callable, Sequence
+from typing import Any, Generic, TypeVar
+
+import gi
+
+from impressive_ui.gtk import ReactiveList, State
+from impressive_ui.reactive_sequence import ListChange, MoveItem, Reset, Splice
+from impressive_ui.reactive_sequence.diff import changed_runs, common_affix_lengths
+
+gi.require_version("Gtk", "4.0")
+
+from gi.repository import Gio, GObject, Gtk  # type: ignore # noqa: E402
+
+ItemT = TypeVar("ItemT")
+KeyT = TypeVar("KeyT")
+
+
+class ListItemObject(GObject.GObject, Generic[ItemT]):
+    """
+    A GObject wrapper that carries a Python item through a Gio.ListStore.
+    This class is not meant to be instantiated directly.
+    """
+
+    def __init__(self, item: ItemT) -> None:
+        super().__init__()
+        self.item = item
+
+
+def ReactiveListView(
+    items: State[Sequence[ItemT]],
+    setup: Callable[[], Gtk.Widget],
+    bind: Callable[[Gtk.Widget, ItemT], Any],
+    *,
+    unbind: Callable[[Gtk.Widget, ItemT], Any] | None = None,
+    key_fn: Callable[[ItemT], KeyT] = id,
+    selection: Callable[[Gio.ListModel], Gtk.SelectionModel] = Gtk.NoSelection.new,
+) -> Gtk.ListView:
+    """
+    Bind a sequence state to a virtualized Gtk.ListView.
+
+    Items live in a Gio.ListStore and rows are only created for the visible
+    part of the list. `setup` creates an empty row widget, `bind` fills it
+    with an item when the row scrolls into view and `unbind` releases it
+    again, so row widgets are recycled and memory stays flat as the data
+    grows.
+
+    Updates of `items` are turned into `Gio.ListStore.splice` calls: the
+    unchanged head and tail are skipped and the changed window is spliced in
+    once. Items that keep their key but are no longer equal are spliced again
+    in place, so their rows are bound to the new item. When `items` is a
+    `ReactiveList`, each change is spliced in directly.
+    """
+    store = Gio.ListStore(item_type=ListItemObject)
+    factory = Gtk.SignalListItemFactory()
+
+    # Use a dict to store mutable state
+    state = {"current_keys": [], "objects": []}
+
+    def on_setup(_factory, list_item: Gtk.ListItem) -> None:
+        list_item.set_child(setup())
+
+    def on_bind(_factory, list_item: Gtk.ListItem) -> None:
+        bind(list_item.get_child(), list_item.get_item().item)
+
+    def on_unbind(_factory, list_item: Gtk.ListItem) -> None:
+        if unbind is not None:
+            unbind(list_item.get_child(), list_item.get_item().item)
+
+    factory.connect("setup", on_setup)
+    factory.connect("bind", on_bind)
+    factory.connect("unbind", on_unbind)
+
+    def splice(start: int, removed: int, objects: Sequence[ListItemObject]) -> None:
+        """Splice objects into the store and mirror the change."""
+        store.splice(start, removed, objects)
+        state["objects"][start : start + removed] = objects
+
+    def wrap(item: ItemT, obj: ListItemObject | None = None) -> ListItemObject:
+        """Wrap item, reusing obj when it still holds an equal item."""
+        # A row is unbound from the item of its old wrapper, so wrappers are
+        # never changed and changed items get a new one
+        if obj is not None and (obj.item is item or obj.item == item):
+            return obj
+        return ListItemObject(item)
+
+    def refresh(start: int, new_items: Sequence[ItemT]) -> None:
+        """Splice the rows from start again whose item changed in place."""
+        objects = state["objects"][start : start + len(new_items)]
+        old_items = [obj.item for obj in objects]
+        for run_start, run_stop in changed_runs(old_items, new_items):
+            splice(
+                start + run_start,
+                run_stop - run_start,
+                [ListItemObject(item) for item in new_items[run_start:run_stop]],
+            )
+
+    def sync_items(new_items: Sequence[ItemT]) -> None:
+        """Splice the changed window of the new items into the store."""
+        old_keys = state["current_keys"]
+        new_keys = [key_fn(item) for item in new_items]
+        prefix, suffix = common_affix_lengths(old_keys, new_keys)
+        old_stop = len(old_keys) - suffix
+        new_stop = len(new_keys) - suffix
+        state["current_keys"] = new_keys
+
+        # Items that kept their key in the head and tail may still be edited
+        refresh(0, new_items[:prefix])
+        refresh(old_stop, new_items[new_stop:])
+
+        if prefix == old_stop and prefix == new_stop:
+            return
+
+        # Reuse the wrappers of items that stay in the window
+        object_by_key = dict(
+            zip(old_keys[prefix:old_stop], state["objects"][prefix:old_stop])
+        )
+        splice(
+            prefix,
+            old_stop - prefix,
+            [
+                wrap(item, object_by_key.pop(key, None))
+                for key, item in zip(
+                    new_keys[prefix:new_stop], new_items[prefix:new_stop]
+                )
+            ],
+        )
+
+    def apply_change(change: ListChange[ItemT]) -> None:
+        """Apply a change from a ReactiveList without diffing the whole list."""
+        match change:
+            case Reset(items=new_items):
+                sync_items(new_items)
+
+            case Splice(start=start, removed=removed, inserted=inserted):
+                splice(start, removed, [ListItemObject(item) for item in inserted])
+                state["current_keys"][start : start + removed] = [
+                    key_fn(item) for item in inserted
+                ]
+
+            case MoveItem(source=source, target=target):
+                obj = state["objects"][source]
+                splice(source, 1, [])
+                splice(target, 0, [obj])
+                keys = state["current_keys"]
+                keys.insert(target, keys.pop(source))
+
+    if isinstance(items, ReactiveList):
+        items.watch_changes(apply_change)
+    else:
+        items.watch(sync_items)
+
+    return Gtk.ListView(model=selection(store), factory=factory)
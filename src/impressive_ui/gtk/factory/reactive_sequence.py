@@ -1,20 +1,52 @@
-from collections.abc import Callable, Iterator, Sequence
+import math
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from typing import Any, TypeVar, overload
 
 import gi
 
 
-from impressive_ui.gtk import State
-from impressive_ui.reactive_sequence import insert_widget, remove_widget, diff_update
+from impressive_ui.gtk import ReactiveList, State
+from impressive_ui.reactive_sequence import (
+    ListChange,
+    MoveItem,
+    Reset,
+    Splice,
+    DiffPlan,
+    clear_container,
+    compute_diff_plan,
+    has_implementation,
+    insert_widget,
+    insert_widget_after,
+    insert_widgets,
+    iter_apply_diff_plan,
+    move_widget,
+    move_widget_after,
+    move_widgets,
+    remove_widget,
+    remove_widgets,
+    set_sort_key,
+    sort_container,
+)
+from impressive_ui.reactive_sequence.keys import StructuralKey, structural_keys
+from impressive_ui.reactive_sequence.splice import apply_change as apply_list_change
 
 gi.require_version("Gtk", "4.0")
 
-from gi.repository import Gtk  # type: ignore # noqa: E402
+from gi.repository import GLib, Gtk  # type: ignore # noqa: E402
 
 ItemT = TypeVar("ItemT")
 KeyT = TypeVar("KeyT", bound=Any)
 
 
+@cache
+def _diff_executor() -> ThreadPoolExecutor:
+    """The worker thread shared by every ReactiveSequence with background diffs."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="reactive-sequence")
+
+
 @insert_widget.register
 def _(container: Gtk.ListBox, widget: Gtk.Widget, index: int) -> None:
     if widget.get_parent() is not None:
@@ -52,6 +84,140 @@ def _(container, widget: Gtk.Widget) -> None:
     container.remove(widget)
 
 
+@insert_widgets.register
+def _(container: Gtk.ListBox, widgets: Sequence[Gtk.Widget], index: int) -> None:
+    for offset, widget in enumerate(widgets):
+        if widget.get_parent() is not None:
+            widget.unparent()
+        container.insert(widget, index + offset)
+
+
+@insert_widgets.register
+def _(container: Gtk.Box, widgets: Sequence[Gtk.Widget], index: int) -> None:
+    # Find the anchor once, then chain every widget after the previous one
+    previous = None
+    if index > 0:
+        previous = container.get_first_child()
+        for _ in range(index - 1):
+            next_child = previous.get_next_sibling() if previous else None
+            if next_child is None:
+                break
+            previous = next_child
+
+    for widget in widgets:
+        if previous is None:
+            container.prepend(widget)
+        else:
+            container.insert_child_after(widget, previous)
+        previous = widget
+
+
+@insert_widgets.register
+def _(container: Gtk.FlowBox, widgets: Sequence[Gtk.Widget], index: int) -> None:
+    for offset, widget in enumerate(widgets):
+        if widget.get_parent() is not None:
+            widget.unparent()
+        container.insert(widget, index + offset)
+
+
+@remove_widgets.register
+def _(container: Gtk.Widget, widgets: Sequence[Gtk.Widget]) -> None:
+    for widget in widgets:
+        container.remove(widget)
+
+
+@clear_container.register
+def _(container: Gtk.ListBox, widgets: Sequence[Gtk.Widget]) -> None:
+    # remove_all is only available since GTK 4.12
+    if hasattr(container, "remove_all"):
+        container.remove_all()
+    else:
+        remove_widgets(container, widgets)
+
+
+@clear_container.register
+def _(container: Gtk.FlowBox, widgets: Sequence[Gtk.Widget]) -> None:
+    # remove_all is only available since GTK 4.12
+    if hasattr(container, "remove_all"):
+        container.remove_all()
+    else:
+        remove_widgets(container, widgets)
+
+
+def _compare_by(key: Callable[[Gtk.Widget], Any]) -> Callable[..., int]:
+    """Turn a sort key for children into a GTK sort function."""
+
+    def compare(a: Gtk.Widget, b: Gtk.Widget, *_user_data: Any) -> int:
+        key_a, key_b = key(a), key(b)
+        return (key_a > key_b) - (key_a < key_b)
+
+    return compare
+
+
+@set_sort_key.register
+def _(container: Gtk.ListBox, key: Callable[[Gtk.Widget], Any]) -> None:
+    container.set_sort_func(_compare_by(key))
+
+
+@set_sort_key.register
+def _(container: Gtk.FlowBox, key: Callable[[Gtk.Widget], Any]) -> None:
+    container.set_sort_func(_compare_by(key))
+
+
+@sort_container.register
+def _(container: Gtk.ListBox) -> None:
+    container.invalidate_sort()
+
+
+@sort_container.register
+def _(container: Gtk.FlowBox) -> None:
+    container.invalidate_sort()
+
+
+def _box_child_before(
+    container: Gtk.Box, index: int, moving: Sequence[Gtk.Widget]
+) -> Gtk.Widget | None:
+    """Find the child that will precede `index` once `moving` is taken out."""
+    if index <= 0:
+        return None
+
+    skipped = {id(widget) for widget in moving}
+    previous = None
+    child = container.get_first_child()
+    while child is not None and index > 0:
+        if id(child) not in skipped:
+            previous = child
+            index -= 1
+        child = child.get_next_sibling()
+    return previous
+
+
+@move_widget.register
+def _(container: Gtk.Box, widget: Gtk.Widget, index: int) -> None:
+    # Reorder in place so the widget stays realized and keeps its state
+    container.reorder_child_after(
+        widget, _box_child_before(container, index, (widget,))
+    )
+
+
+@move_widgets.register
+def _(container: Gtk.Box, widgets: Sequence[Gtk.Widget], index: int) -> None:
+    previous = _box_child_before(container, index, widgets)
+    for widget in widgets:
+        container.reorder_child_after(widget, previous)
+        previous = widget
+
+
+@insert_widget_after.register
+def _(container: Gtk.Box, widget: Gtk.Widget, sibling: Gtk.Widget | None) -> None:
+    container.insert_child_after(widget, sibling)
+
+
+@move_widget_after.register
+def _(container: Gtk.Box, widget: Gtk.Widget, sibling: Gtk.Widget | None) -> None:
+    container.reorder_child_after(widget, sibling)
+
+
 def Conditional(
     state: State[bool],
     true: Gtk.Widget,
@@ -63,17 +229,24 @@ def Conditional(
     return overlay
 
 
-ItemT = TypeVar("ItemT")
-KeyT = TypeVar("KeyT")
-
-
 @overload
 def ReactiveSequence(
     container: Gtk.Box,
     items: State[Sequence[ItemT]],
     factory: Callable[[ItemT], Gtk.Widget],
     *,
-    key_fn: Callable[[ItemT], KeyT] = id,
+    key_fn: Callable[[ItemT], KeyT] | None = id,
+    rebind: Callable[[Gtk.Widget, ItemT], Any] | None = None,
+    pool_size: int = 64,
+    update: Callable[[Gtk.Widget, ItemT, ItemT], Any] | None = None,
+    populate_budget: float | None = None,
+    placeholder: Gtk.Widget | None = None,
+    on_populated: Callable[[], Any] | None = None,
+    frame_budget: float | None = None,
+    background_diff: bool = False,
+    rebuild_threshold: float | None = None,
+    on_plan: Callable[[DiffPlan], Any] | None = None,
+    native_sort: bool = False,
 ) -> Gtk.Box: ...
 
 
@@ -83,7 +256,18 @@ def ReactiveSequence(
     items: State[Sequence[ItemT]],
     factory: Callable[[ItemT], Gtk.ListBoxRow],
     *,
-    key_fn: Callable[[ItemT], KeyT] = id,
+    key_fn: Callable[[ItemT], KeyT] | None = id,
+    rebind: Callable[[Gtk.ListBoxRow, ItemT], Any] | None = None,
+    pool_size: int = 64,
+    update: Callable[[Gtk.ListBoxRow, ItemT, ItemT], Any] | None = None,
+    populate_budget: float | None = None,
+    placeholder: Gtk.Widget | None = None,
+    on_populated: Callable[[], Any] | None = None,
+    frame_budget: float | None = None,
+    background_diff: bool = False,
+    rebuild_threshold: float | None = None,
+    on_plan: Callable[[DiffPlan], Any] | None = None,
+    native_sort: bool = False,
 ) -> Gtk.ListBox: ...
 
 
@@ -93,7 +277,18 @@ def ReactiveSequence(
     items: State[Sequence[ItemT]],
     factory: Callable[[ItemT], Gtk.FlowBoxChild],
     *,
-    key_fn: Callable[[ItemT], KeyT] = id,
+    key_fn: Callable[[ItemT], KeyT] | None = id,
+    rebind: Callable[[Gtk.FlowBoxChild, ItemT], Any] | None = None,
+    pool_size: int = 64,
+    update: Callable[[Gtk.FlowBoxChild, ItemT, ItemT], Any] | None = None,
+    populate_budget: float | None = None,
+    placeholder: Gtk.Widget | None = None,
+    on_populated: Callable[[], Any] | None = None,
+    frame_budget: float | None = None,
+    background_diff: bool = False,
+    rebuild_threshold: float | None = None,
+    on_plan: Callable[[DiffPlan], Any] | None = None,
+    native_sort: bool = False,
 ) -> Gtk.FlowBox: ...
 
 
@@ -102,57 +297,635 @@ def ReactiveSequence(
     items: State[Sequence[ItemT]],
     factory: Callable[[ItemT], Any],
     *,
-    key_fn: Callable[[ItemT], KeyT] = id,
+    key_fn: Callable[[ItemT], KeyT] | None = id,
+    rebind: Callable[[Any, ItemT], Any] | None = None,
+    pool_size: int = 64,
+    update: Callable[[Any, ItemT, ItemT], Any] | None = None,
+    populate_budget: float | None = None,
+    placeholder: Gtk.Widget | None = None,
+    on_populated: Callable[[], Any] | None = None,
+    frame_budget: float | None = None,
+    background_diff: bool = False,
+    rebuild_threshold: float | None = None,
+    on_plan: Callable[[DiffPlan], Any] | None = None,
+    native_sort: bool = False,
 ) -> Gtk.Widget:
-    """Bind a sequence state to a GTK container with efficient diff updates."""
+    """
+    Bind a sequence state to a GTK container with efficient diff updates.
+
+    When `items` is a `ReactiveList`, its splice changes are applied directly
+    and the diff only runs when the whole list is replaced.
+
+    Rows are matched across updates by `key_fn`, which defaults to the
+    identity of each item. With `key_fn=None`, hashable items such as tuples
+    and frozen dataclasses are keyed by value instead, so rebuilding equal
+    items, for example by querying a database again, keeps every row.
+
+    Passing `rebind` turns on widget recycling: up to `pool_size` removed
+    widgets are kept detached, and new items reuse one of them through
+    `rebind(widget, item)` instead of calling `factory`.
+
+    Passing `update` turns on in-place updates: when an item keeps its key
+    but no longer compares equal, `update(widget, old_item, new_item)` is
+    called on its existing widget instead of leaving the row as it was.
+
+    Passing `populate_budget` turns on progressive population: when items
+    arrive while the container is empty, rows are built in chunks of at most
+    `populate_budget` seconds across GLib idle iterations, so the main loop
+    stays responsive while a large list loads. `placeholder` is shown after
+    the rows built so far until the population completes, and `on_populated`
+    is called once it does. Items appended during the population are picked
+    up by later chunks; any other change completes it at once.
+
+    Passing `frame_budget` time-slices diff updates: operations are applied
+    for at most `frame_budget` seconds per frame of the container's frame
+    clock, so large updates do not block input and rendering. A newer list
+    that arrives before an update is finished replaces the rest of it, and
+    is diffed against the rows as they are at that point.
+
+    Passing `background_diff=True` computes the keys and the diff in a worker
+    thread, and only applies the finished plan on the main loop. Plans for
+    lists that were replaced before they finished are discarded. `key_fn`
+    and item equality must then be safe to call from another thread.
+
+    Passing `rebuild_threshold` clears the container and builds every row
+    again when more than that share of the rows would be removed or inserted,
+    such as when switching to a different data set. `on_plan` is called with
+    every `DiffPlan` before it is applied; its `rebuild` flag tells which path
+    was taken.
+
+    Passing `native_sort=True` lets containers with a sort function, such as
+    Gtk.ListBox and Gtk.FlowBox, order the rows themselves: rows stay where
+    they are while an update is applied, each row is ranked by its position
+    in the list, and one `sort_container` call reorders them all. Updates are
+    then applied whole, even with `frame_budget`.
+    """
 
     # Use a dict to store mutable state
-    state = {"current_items": tuple(), "widget_by_key": {}}
-
-    def get_container_widgets() -> Iterator[Gtk.Widget]:
-        """Get current widgets in container in order."""
-        child = container.get_first_child()
-        while child:
-            yield child
-            child = child.get_next_sibling()
+    state = {
+        "current_items": [],
+        "current_keys": [],
+        "widgets": [],
+        "removed": set(),
+        "links": None,
+        "successors": None,
+        "widget_by_key": {},
+        "key_by_widget": {},
+        "pool": [],
+        "pending": None,
+        "populate_source": None,
+        "placeholder_shown": False,
+        "item_by_widget": {},
+        "plan": None,
+        "target": None,
+        "tick": None,
+        "generation": 0,
+        "rank_by_widget": {},
+        "next_rank": 0,
+        "unsorted": False,
+    }
+
+    def track_widget(key: KeyT, widget: Gtk.Widget) -> None:
+        """Track a widget by key in both directions."""
+        state["widget_by_key"][key] = widget
+        state["key_by_widget"][widget] = key
+
+    def untrack_widget(widget: Gtk.Widget) -> None:
+        """Stop tracking a removed widget."""
+        state["item_by_widget"].pop(widget, None)
+        state["rank_by_widget"].pop(widget, None)
+        key = state["key_by_widget"].pop(widget, None)
+        if state["widget_by_key"].get(key) is widget:
+            del state["widget_by_key"][key]
+
+    def compact_widgets() -> None:
+        """Drop removed widgets from the ordered widget list in a single pass."""
+        if state["removed"]:
+            removed = state["removed"]
+            state["widgets"] = [w for w in state["widgets"] if w not in removed]
+            state["removed"] = set()
+        if state["links"] is not None:
+            # Write the order left by the moves of a plan back in one pass
+            following = state["links"][0]
+            widgets = []
+            widget = following[None]
+            while widget is not None:
+                widgets.append(widget)
+                widget = following[widget]
+            state["widgets"] = widgets
+            state["links"] = None
+
+    def link_widgets() -> tuple[dict, dict]:
+        """Link the ordered widgets to their neighbours, for a plan's moves."""
+        if state["links"] is None:
+            compact_widgets()
+            # None stands for both ends of the list
+            order = [None, *state["widgets"]]
+            following = dict(zip(order, [*order[1:], None]))
+            preceding = dict(zip(following.values(), following))
+            state["links"] = (following, preceding)
+        return state["links"]
+
+    def successor_of(widget: Gtk.Widget) -> Gtk.Widget | None:
+        """Get the row a plan moves widget right in front of."""
+        if state["successors"] is None:
+            # A moved row lands before the next row of the new list that was
+            # already in the old one, which is in place by then
+            tracked = state["widget_by_key"]
+            successors = {}
+            following = None
+            for key in reversed(state["target"][1]):
+                if key in tracked:
+                    successors[tracked[key]] = following
+                    following = tracked[key]
+            state["successors"] = successors
+        return state["successors"][widget]
+
+    def link_before(widgets: Sequence[Gtk.Widget], successor: Gtk.Widget | None):
+        """Relink a run of widgets so that it ends right before successor."""
+        following, preceding = link_widgets()
+        for widget in widgets:
+            before, after = preceding[widget], following[widget]
+            following[before], preceding[after] = after, before
+            before = preceding[successor]
+            following[before], preceding[widget] = widget, before
+            following[widget], preceding[successor] = successor, widget
+
+    def release_widget(widget: Gtk.Widget) -> None:
+        """Keep a removed widget for reuse when recycling is enabled."""
+        if rebind is not None and len(state["pool"]) < pool_size:
+            state["pool"].append(widget)
+
+    def clear_widgets_in_container(widgets: Sequence[Gtk.Widget]) -> None:
+        """Remove every widget from container and clean up tracking."""
+        clear_container(container, widgets)
+        state["widgets"] = []
+        state["removed"] = set()
+        state["links"] = None
+        for widget in widgets:
+            untrack_widget(widget)
+            release_widget(widget)
 
     def remove_widget_from_container(widget: Gtk.Widget) -> None:
         """Remove widget from container and clean up tracking."""
-        remove_widget(container, widget)
-
-        # Remove from tracking dict
-        for key, tracked_widget in list(state["widget_by_key"].items()):
-            if tracked_widget is widget:
-                del state["widget_by_key"][key]
-                break
+        remove_widgets_from_container((widget,))
+
+    def remove_widgets_from_container(widgets: Sequence[Gtk.Widget]) -> None:
+        """Remove a run of widgets from container and clean up tracking."""
+        remove_widgets(container, widgets)
+
+        # Removed widgets leave the ordered list lazily, so that removing
+        # many rows in one sync costs a single pass over the list
+        state["removed"].update(widgets)
+        for widget in widgets:
+            untrack_widget(widget)
+            release_widget(widget)
+
+    # Containers that place children relative to a sibling (Gtk.Box) find
+    # their anchor in the ordered widget list instead of walking the children.
+    anchored = has_implementation(insert_widget_after, container)
+
+    def rank_of(child: Gtk.Widget) -> float:
+        """Get the rank of a container child, looking through row wrappers."""
+        ranks = state["rank_by_widget"]
+        if child in ranks:
+            return ranks[child]
+        # Children that are not rows, such as the placeholder, sort last
+        return ranks.get(child.get_child(), math.inf)
+
+    def rank_widgets(widgets: Sequence[Gtk.Widget], position: int) -> None:
+        """Rank new widgets after every row and note when they belong elsewhere."""
+        if position < len(state["widgets"]):
+            state["unsorted"] = True
+        for widget in widgets:
+            state["rank_by_widget"][widget] = state["next_rank"]
+            state["next_rank"] += 1
+
+    def sort_rows(keys: Sequence[KeyT]) -> None:
+        """Rank the widgets in the order of keys and let the container sort."""
+        if not state["unsorted"]:
+            return
+        widgets = [state["widget_by_key"][key] for key in keys]
+        state["widgets"] = widgets
+        state["removed"] = set()
+        state["rank_by_widget"] = dict(zip(widgets, range(len(widgets))))
+        state["next_rank"] = len(widgets)
+        state["unsorted"] = False
+        sort_container(container)
+
+    def ordered_widgets() -> list[Gtk.Widget]:
+        """Get the widgets in container order."""
+        compact_widgets()
+        if state["unsorted"] and state["plan"] is not None:
+            # Moves of the running plan were left to the final sort
+            sort_rows(state["target"][1])
+        return state["widgets"]
+
+    def sibling_before(position: int) -> Gtk.Widget | None:
+        """Get the widget that precedes position in the ordered widget list."""
+        position = min(position, len(state["widgets"]))
+        return state["widgets"][position - 1] if position > 0 else None
 
     def insert_widget_in_container(widget: Gtk.Widget, position: int) -> None:
         """Insert widget at position in container."""
-        insert_widget(container, widget, position)
-
-    def create_and_track_widget(item: ItemT) -> Gtk.Widget:
-        """Create widget and track it by key."""
-        widget = factory(item)
-        state["widget_by_key"][key_fn(item)] = widget
+        compact_widgets()
+        if native_sort:
+            rank_widgets((widget,), position)
+        if anchored:
+            insert_widget_after(container, widget, sibling_before(position))
+        else:
+            insert_widget(container, widget, position)
+        state["widgets"].insert(position, widget)
+
+    def insert_widgets_in_container(
+        widgets: Sequence[Gtk.Widget], position: int
+    ) -> None:
+        """Insert a run of widgets starting at position in container."""
+        compact_widgets()
+        if native_sort:
+            rank_widgets(widgets, position)
+        if anchored:
+            sibling = sibling_before(position)
+            for widget in widgets:
+                insert_widget_after(container, widget, sibling)
+                sibling = widget
+        else:
+            insert_widgets(container, widgets, position)
+        state["widgets"][position:position] = widgets
+
+    def move_widget_in_container(widget: Gtk.Widget, position: int) -> None:
+        """Move a widget already in container to position."""
+        compact_widgets()
+        state["widgets"].remove(widget)
+        if native_sort:
+            state["widgets"].insert(position, widget)
+            state["unsorted"] = True
+            return
+        if anchored:
+            move_widget_after(container, widget, sibling_before(position))
+        else:
+            move_widget(container, widget, position)
+        state["widgets"].insert(position, widget)
+
+    def move_planned_widgets(widgets: Sequence[Gtk.Widget], position: int) -> None:
+        """
+        Move a run of widgets as a plan does, right before their successor.
+
+        The widgets are relinked instead of shifting the ordered widget list,
+        which is written back once the plan needs it in order again.
+        """
+        link_before(widgets, successor_of(widgets[-1]))
+        if anchored:
+            sibling = state["links"][1][widgets[0]]
+            for widget in widgets:
+                move_widget_after(container, widget, sibling)
+                sibling = widget
+        elif len(widgets) == 1:
+            move_widget(container, widgets[0], position)
+        else:
+            move_widgets(container, widgets, position)
+
+    def key_items(
+        new_items: Sequence[ItemT], old_keys: Sequence[KeyT] = ()
+    ) -> list[Any]:
+        """Key a whole new list of items, keeping the keys of equal old items."""
+        if key_fn is None:
+            return structural_keys(new_items, old_keys)
+        return [key_fn(item) for item in new_items]
+
+    def key_new_items(
+        new_items: Sequence[ItemT], replaced: Sequence[KeyT] = ()
+    ) -> list[Any]:
+        """Key items that join the list, without taking the keys of other rows."""
+        if key_fn is not None:
+            return [key_fn(item) for item in new_items]
+
+        # Equal items are numbered past the keys already in use
+        tracked, freed = state["widget_by_key"], set(replaced)
+        keys = []
+        assigned = set()
+        for item in new_items:
+            key = StructuralKey(item)
+            while key in assigned or (key in tracked and key not in freed):
+                key = StructuralKey(item, key.occurrence + 1, key.item_hash)
+            assigned.add(key)
+            keys.append(key)
+        return keys
+
+    def create_and_track_widget(key: KeyT, item: ItemT) -> Gtk.Widget:
+        """Create or recycle a widget and track it by key."""
+        if rebind is not None and state["pool"]:
+            widget = state["pool"].pop()
+            rebind(widget, item)
+        else:
+            widget = factory(item)
+        track_widget(key, widget)
+        state["item_by_widget"][widget] = item
         return widget
 
-    @items.watch
-    def sync_items(new_items: Sequence[ItemT]):
-        """Sync container using efficient diff algorithm."""
+    def update_widget(widget: Gtk.Widget, old_item: ItemT, new_item: ItemT) -> None:
+        """Update a widget in place for a changed item."""
+        if update is not None:
+            update(widget, old_item, new_item)
+        state["item_by_widget"][widget] = new_item
+
+    def populate_chunk() -> bool:
+        """Build rows for pending items until the budget is spent."""
+        pending = state["pending"]
+        start = len(state["current_items"])
+        # Population only starts when there is a budget
+        budget = populate_budget if populate_budget is not None else 0.0
+        deadline = time.monotonic() + budget
+        keys = []
+        widgets = []
+        stop = start
+        while stop < len(pending) and (stop == start or time.monotonic() < deadline):
+            key = key_new_items((pending[stop],))[0]
+            keys.append(key)
+            widgets.append(create_and_track_widget(key, pending[stop]))
+            stop += 1
+
+        insert_widgets_in_container(widgets, start)
+        state["current_items"].extend(pending[start:stop])
+        state["current_keys"].extend(keys)
+
+        if stop < len(pending):
+            return GLib.SOURCE_CONTINUE
+        state["populate_source"] = None
+        finish_population()
+        return GLib.SOURCE_REMOVE
+
+    def start_population(new_items: Sequence[ItemT]) -> None:
+        """Build the first chunk of rows now and schedule the rest."""
+        state["pending"] = list(new_items)
+        if populate_chunk() == GLib.SOURCE_REMOVE:
+            return
+        if placeholder is not None:
+            insert_widget(container, placeholder, len(state["widgets"]))
+            state["placeholder_shown"] = True
+        state["populate_source"] = GLib.idle_add(populate_chunk)
+
+    def stop_population() -> None:
+        """Stop building rows in the background and take the placeholder out."""
+        if state["populate_source"] is not None:
+            GLib.source_remove(state["populate_source"])
+            state["populate_source"] = None
+        if state["placeholder_shown"]:
+            remove_widget(container, placeholder)
+            state["placeholder_shown"] = False
+        state["pending"] = None
+
+    def finish_population() -> None:
+        """Stop building rows in the background and report completion."""
+        stop_population()
+        if on_populated is not None:
+            on_populated()
 
-        diff_update(
-            container=None,  # We don't actually need this if we pass functions directly
-            old_source=state["current_items"],
+    def sync_items(new_items: Sequence[ItemT]):
+        """Sync container, populating it progressively when it is empty."""
+        if state["plan"] is not None:
+            drop_plan()
+        # Any plan still being computed in the background is for an older list
+        state["generation"] += 1
+        state["target"] = None
+
+        if state["pending"] is not None:
+            # A new list replaces whatever was still waiting to be built
+            stop_population()
+            diff_items(new_items, now=True)
+            finish_population()
+        elif populate_budget is not None and new_items and not state["current_keys"]:
+            start_population(new_items)
+        else:
+            diff_items(new_items)
+
+    def drop_plan() -> None:
+        """Drop an unfinished update and read back the rows it left."""
+        state["plan"].close()
+        state["plan"] = state["target"] = state["successors"] = None
+        widgets = ordered_widgets()
+        state["current_keys"] = [state["key_by_widget"][w] for w in widgets]
+        state["current_items"] = [state["item_by_widget"][w] for w in widgets]
+
+    def run_plan(budget: float | None) -> bool:
+        """Apply update steps until the budget is spent. Return whether done."""
+        if state["plan"] is None:
+            return True
+
+        deadline = None if budget is None else time.monotonic() + budget
+        for _ in state["plan"]:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+        compact_widgets()
+        state["current_items"], state["current_keys"] = state["target"]
+        state["plan"] = state["target"] = state["successors"] = None
+        if native_sort:
+            sort_rows(state["current_keys"])
+        return True
+
+    def on_tick(_widget: Gtk.Widget, _frame_clock: Any) -> bool:
+        """Continue an unfinished update on every frame."""
+        if run_plan(frame_budget):
+            state["tick"] = None
+            return GLib.SOURCE_REMOVE
+        return GLib.SOURCE_CONTINUE
+
+    def update_in_place(
+        _container: None, widget: Gtk.Widget, old_item: ItemT, new_item: ItemT
+    ) -> None:
+        """Update a widget in place, as an Update operation of a plan."""
+        update_widget(widget, old_item, new_item)
+
+    def defer_moves(_container: None, _widgets: Any, _position: int) -> None:
+        """Leave the moves of a plan to the sort once the whole plan is applied."""
+        state["unsorted"] = True
+
+    def plan_diff(
+        old_keys: Sequence[KeyT],
+        new_keys: Sequence[KeyT],
+        old_items: Sequence[ItemT],
+        new_items: Sequence[ItemT],
+    ) -> DiffPlan[KeyT]:
+        """Compute the operations that turn the old items into the new ones."""
+        return compute_diff_plan(
+            old_keys,
+            new_keys,
+            coalesce=True,
+            old_source=old_items if update is not None else None,
             new_source=new_items,
-            key_func=key_fn,
-            factory=create_and_track_widget,
+            rebuild_threshold=rebuild_threshold,
+        )
+
+    def start_plan(
+        plan: DiffPlan[KeyT],
+        new_items: list[ItemT],
+        new_keys: list[KeyT],
+        budget: float | None,
+    ) -> None:
+        """Apply the first slice of a plan and schedule the rest."""
+        if on_plan is not None:
+            on_plan(plan)
+        if native_sort:
+            # Deferred moves leave the rows out of order until the plan is done
+            budget = None
+        state["target"] = (new_items, new_keys)
+        state["successors"] = None
+        state["plan"] = iter_apply_diff_plan(
+            None,
+            plan,
+            state["current_keys"],
+            new_items,
+            create_and_track_widget,
             remove=lambda _container, widget: remove_widget_from_container(widget),
             insert=lambda _container, widget, pos: insert_widget_in_container(
                 widget, pos
             ),
-            get_container_items=lambda _container: tuple(get_container_widgets()),
+            get_container_items=lambda _container: ordered_widgets(),
+            remove_range=lambda _container, widgets: remove_widgets_from_container(
+                widgets
+            ),
+            insert_range=lambda _container, widgets, pos: insert_widgets_in_container(
+                widgets, pos
+            ),
+            move=(
+                defer_moves
+                if native_sort
+                else lambda _container, widget, pos: move_planned_widgets(
+                    (widget,), pos
+                )
+            ),
+            move_range=(
+                defer_moves
+                if native_sort
+                else lambda _container, widgets, pos: move_planned_widgets(widgets, pos)
+            ),
+            old_source=state["current_items"],
+            update=update_in_place if update is not None else None,
+            clear=lambda _container, widgets: clear_widgets_in_container(widgets),
         )
-
-        state["current_items"] = new_items
+        if run_plan(budget) or state["tick"] is not None:
+            return
+        if container.get_mapped():
+            state["tick"] = container.add_tick_callback(on_tick)
+        else:
+            # Without a running frame clock there is no frame to wait for
+            run_plan(None)
+
+    def diff_items(new_items: Sequence[ItemT], now: bool = False):
+        """
+        Sync container using efficient diff algorithm.
+
+        Unless `now` is set, the diff may run in the background and be applied
+        over several frames.
+        """
+        if background_diff and not now:
+            request_plan(new_items)
+            return
+
+        # Keys of the current items are kept from the previous sync
+        new_items = list(new_items)
+        new_keys = key_items(new_items, state["current_keys"])
+        plan = plan_diff(
+            state["current_keys"], new_keys, state["current_items"], new_items
+        )
+        start_plan(plan, new_items, new_keys, None if now else frame_budget)
+
+    def request_plan(new_items: Sequence[ItemT]) -> None:
+        """Compute the keys and operations for new_items in a worker thread."""
+        generation = state["generation"]
+        old_keys = list(state["current_keys"])
+        old_items = list(state["current_items"]) if update is not None else ()
+        new_items = list(new_items)
+        state["target"] = (new_items, None)
+
+        def compute() -> None:
+            if generation != state["generation"]:
+                return  # Superseded before it started
+            new_keys = key_items(new_items, old_keys)
+            plan = plan_diff(old_keys, new_keys, old_items, new_items)
+            GLib.idle_add(receive_plan, generation, new_keys, plan)
+
+        _diff_executor().submit(compute)
+
+    def receive_plan(
+        generation: int, new_keys: list[KeyT], plan: DiffPlan[KeyT]
+    ) -> bool:
+        """Apply a plan from the worker thread unless a newer one was requested."""
+        if generation == state["generation"]:
+            start_plan(plan, state["target"][0], new_keys, frame_budget)
+        return GLib.SOURCE_REMOVE
+
+    def apply_change(change: ListChange[ItemT]) -> None:
+        """Apply a change from a ReactiveList without diffing the whole list."""
+        if state["target"] is not None and not isinstance(change, Reset):
+            # The change is relative to the list an unfinished update targets
+            target = list(state["target"][0])
+            apply_list_change(target, change)
+            sync_items(target)
+            return
+
+        if state["pending"] is not None and not isinstance(change, Reset):
+            # Changes past the rows built so far only touch the pending items
+            apply_list_change(state["pending"], change)
+            first = (
+                change.start
+                if isinstance(change, Splice)
+                else min(change.source, change.target)
+            )
+            if first < len(state["current_items"]):
+                sync_items(state["pending"])
+            return
+
+        current_items, current_keys = state["current_items"], state["current_keys"]
+        widgets = state["widgets"]
+
+        match change:
+            case Reset(items=new_items):
+                sync_items(new_items)
+
+            case Splice(start=start, removed=removed, inserted=inserted):
+                stop = start + removed
+                inserted_keys = key_new_items(inserted, current_keys[start:stop])
+                if update is not None and inserted_keys == current_keys[start:stop]:
+                    # Same keys in the same places: update the rows in place
+                    for i, item in enumerate(inserted, start):
+                        if current_items[i] is not item and current_items[i] != item:
+                            update_widget(widgets[i], current_items[i], item)
+                    current_items[start:stop] = inserted
+                    return
+
+                if removed:
+                    remove_widgets(container, widgets[start:stop])
+                    for widget in widgets[start:stop]:
+                        untrack_widget(widget)
+                        release_widget(widget)
+                    del widgets[start:stop]
+                if inserted:
+                    insert_widgets_in_container(
+                        [
+                            create_and_track_widget(key, item)
+                            for key, item in zip(inserted_keys, inserted)
+                        ],
+                        start,
+                    )
+                current_items[start:stop] = inserted
+                current_keys[start:stop] = inserted_keys
+
+            case MoveItem(source=source, target=target):
+                move_widget_in_container(widgets[source], target)
+                current_items.insert(target, current_items.pop(source))
+                current_keys.insert(target, current_keys.pop(source))
+
+        if native_sort:
+            sort_rows(current_keys)
+
+    if native_sort:
+        set_sort_key(container, rank_of)
+
+    if isinstance(items, ReactiveList):
+        items.watch_changes(apply_change)
+    else:
+        items.watch(sync_items)
 
     return container
@@ -1,7 +1,24 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Sequence
 from typing import Any, Generic, TypeVar, TYPE_CHECKING
 from gi.repository import GLib, GObject  # type: ignore
 
+from impressive_ui.core import WriteBatch
+from impressive_ui.core import state as core
+from impressive_ui.reactive_sequence.operators import (
+    FilterOperator,
+    ListOperator,
+    MapOperator,
+    SortOperator,
+)
+from impressive_ui.reactive_sequence.splice import (
+    ListChange,
+    MoveItem,
+    Reset,
+    Splice,
+    apply_change,
+    normalize_splice,
+)
+
 if TYPE_CHECKING:
     from impressive_ui.abc.state import (
         check_state_impl,
@@ -10,6 +27,7 @@ if TYPE_CHECKING:
 
 T = TypeVar("T")
 U = TypeVar("U")
+V = TypeVar("V")
 
 
 class GtkStateObject(GObject.GObject, Generic[T]):
@@ -25,32 +43,50 @@ class GtkStateObject(GObject.GObject, Generic[T]):
         self.value = initial_value
 
 
-class State(Generic[T]):
+class GLibScheduler:
+    """Call callbacks from the GLib main loop, from any thread."""
+
+    def call_soon(self, callback: Callable[[], Any]) -> None:
+        def run() -> bool:
+            callback()
+            return GLib.SOURCE_REMOVE
+
+        GLib.idle_add(run)
+
+
+# Pending writes of every mutable state, applied together by one idle source
+_writes = WriteBatch(GLibScheduler())
+
+
+class State(core.State[T]):
     def __init__(self, initial_value: T) -> None:
+        super().__init__(initial_value, GLibScheduler())
         self._obj = GtkStateObject(initial_value)
+        # Values set through property bindings reach the watchers as well
+        self._obj.connect("notify::value", self._on_notify)
 
-    @property
-    def value(self) -> T:
-        """
-        The current state value.
-        This property is used to access the value of the state.
-        """
-        return self._obj.value
+    def _on_notify(self, *_) -> None:
+        core.State._assign(self, self._obj.value)
 
-    def get(self) -> T:
-        return self.value
+    def _assign(self, value: T) -> None:
+        self._obj.value = value
 
-    def watch(self, callback: Callable[[T], Any]) -> Callable[[], None]:
-        callback(self._obj.value)
-        connection = self._obj.connect(
-            "notify::value", lambda *_: callback(self._obj.value)
-        )
-        return lambda: self._obj.disconnect(connection)
+    def _derive(self) -> "MutableState[Any]":
+        return MutableState(None)
+
+    def map(self, mapper: Callable[[T], U], /) -> "State[U]":
+        # Derived states are GTK states, which can be bound to properties
+        derived = self._derive()
+        derived._depend_on((self,), mapper)
+        return derived
 
     def bind(self, target: GObject.Object, property_name: str) -> GObject.Binding:
         """
         Bind this state to a GObject property using GTK's property binding system.
+
+        A derived state keeps following its sources from then on.
         """
+        self._observe()
         return self._obj.bind_property(
             "value",
             target,
@@ -60,24 +96,76 @@ class State(Generic[T]):
             lambda binding, value: value,
         )
 
-    def map(self, mapper: Callable[[T], U], /) -> "State[U]":
-        derived = MutableState(mapper(self._obj.value))
-        self.watch(lambda v: derived.set(mapper(v)))
+    def map_items(
+        self: "State[Sequence[U]]", mapper: Callable[[U], V], /
+    ) -> "ReactiveList[V]":
+        """
+        Derive a list with `mapper` applied to every item.
+
+        When this state is a `ReactiveList`, only inserted items are mapped.
+        """
+        return _derive_items(self, MapOperator(mapper))
+
+    def filter_items(
+        self: "State[Sequence[U]]",
+        predicate: "Callable[[U], Any] | State[Callable[[U], Any]]",
+        /,
+    ) -> "ReactiveList[U]":
+        """
+        Derive a list of the items for which `predicate` is true.
+
+        When this state is a `ReactiveList`, the predicate only runs for
+        inserted items. The predicate can itself be a state, such as one
+        derived from a search entry; changing it splices only the items that
+        started or stopped passing.
+        """
+        if not isinstance(predicate, State):
+            return _derive_items(self, FilterOperator(predicate))
+
+        operator = FilterOperator(predicate.value)
+        derived = _derive_items(self, operator)
+
+        def refilter(new_predicate: Callable[[U], Any]) -> None:
+            for change in operator.set_predicate(new_predicate):
+                derived._apply_change(change)
+
+        predicate.watch(refilter)
         return derived
 
+    def sort_items(
+        self: "State[Sequence[U]]",
+        key: Callable[[U], Any],
+        /,
+        *,
+        reverse: bool = False,
+    ) -> "ReactiveList[U]":
+        """
+        Derive a list of the items sorted by `key`.
+
+        When this state is a `ReactiveList`, each inserted item is placed by
+        binary search instead of sorting the whole list again.
+        """
+        return _derive_items(self, SortOperator(key, reverse))
+
 
 if TYPE_CHECKING:
     check_state_impl(State)
 
 
-class MutableState(State[T]):
+class MutableState(State[T], core.MutableState[T]):
     def set(self, value: T) -> None:
-        GLib.idle_add(lambda: setattr(self._obj, "value", value))
+        """
+        Set a new value from any thread.
 
-    def update(self, updater: Callable[[T], T]) -> None:
-        self.set(updater(self._obj.value))
+        The value is applied on the next main loop iteration. Writes made
+        before then are coalesced, so only the latest value is applied and
+        watchers are notified once, and the writes to all states share one
+        idle source.
+        """
+        _writes.write(self, self._assign, value)
 
     def bind_twoway(self, target: GObject.Object, property_name: str) -> Any:
+        self._observe()
         binding = self._obj.bind_property(
             "value",
             target,
@@ -91,3 +179,165 @@ class MutableState(State[T]):
 
 if TYPE_CHECKING:
     check_mutable_state_impl(MutableState)
+
+
+class ReactiveList(MutableState[Sequence[T]]):
+    """
+    A mutable list state that publishes every edit as a precise change.
+
+    `append`, `insert`, `pop`, `remove`, `move` and `splice` edit the list in
+    place and immediately emit a `Splice` or `MoveItem` to `watch_changes`
+    callbacks, so consumers such as `ReactiveSequence` never have to diff the
+    whole list. Plain `watch` callbacks and bindings are still notified after
+    every edit. `set` and `update` replace the whole list and emit a `Reset`.
+
+    Unlike `set`, the list methods apply synchronously and must be called from
+    the main thread. They apply any pending `set` first, as do `len` and
+    indexing, and `update` is given the items of a pending `set` as well.
+    `value` is a live view of the list and must not be mutated directly.
+
+    >>> items = ReactiveList([1, 2])
+    >>> items.set([10, 20])
+    >>> items.append(30)
+    >>> items.update(lambda items: [*items, 40])
+    >>> items.update(lambda items: [*items, 50])
+    >>> while GLib.MainContext.default().iteration(False):
+    ...     pass
+    >>> list(items)
+    [10, 20, 30, 40, 50]
+    """
+
+    def __init__(self, initial_items: Iterable[T] = ()) -> None:
+        self._items: list[T] = list(initial_items)
+        self._change_callbacks: list[Callable[[ListChange[T]], Any]] = []
+        super().__init__(self._items)
+
+    def __len__(self) -> int:
+        self._apply_pending_set()
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> T:
+        self._apply_pending_set()
+        return self._items[index]
+
+    def watch_changes(
+        self, callback: Callable[[ListChange[T]], Any]
+    ) -> Callable[[], None]:
+        """
+        Register a callback to be called with every change to the list.
+
+        The callback is called immediately with a `Reset` of the current items.
+        Returns a function that can be called to unregister the callback.
+        """
+        callback(Reset(items=tuple(self._items)))
+        self._change_callbacks.append(callback)
+        return lambda: self._change_callbacks.remove(callback)
+
+    def _emit(self, change: ListChange[T]) -> None:
+        for callback in tuple(self._change_callbacks):
+            callback(change)
+        self._assign(self._items)
+
+    def _apply_change(self, change: ListChange[T]) -> None:
+        self._apply_pending_set()
+        apply_change(self._items, change)
+        self._emit(change)
+
+    def _apply_pending_set(self) -> None:
+        """Apply a pending `set` now, so that an edit in place follows it."""
+        write = _writes.take(self)
+        if write is not None:
+            self._reset(write[1])
+
+    def _reset(self, items: Iterable[T]) -> None:
+        self._items = list(items)
+        self._emit(Reset(items=tuple(self._items)))
+
+    def set(self, value: Sequence[T]) -> None:
+        _writes.write(self, self._reset, value)
+
+    def update(self, updater: Callable[[Sequence[T]], Sequence[T]]) -> None:
+        self.set(updater(tuple(_writes.pending(self, self._items))))
+
+    def splice(self, start: int, removed: int, items: Iterable[T] = ()) -> list[T]:
+        """
+        Remove `removed` items from `start` and insert `items` in their place.
+
+        Returns the removed items.
+        """
+        self._apply_pending_set()
+        start, removed = normalize_splice(len(self._items), start, removed)
+        inserted = tuple(items)
+        deleted = self._items[start : start + removed]
+        if not deleted and not inserted:
+            return deleted
+        self._items[start : start + removed] = inserted
+        self._emit(Splice(start=start, removed=removed, inserted=inserted))
+        return deleted
+
+    def append(self, item: T) -> None:
+        """Append an item to the end of the list."""
+        self._apply_pending_set()
+        self.splice(len(self._items), 0, (item,))
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Append items to the end of the list."""
+        self._apply_pending_set()
+        self.splice(len(self._items), 0, items)
+
+    def insert(self, index: int, item: T) -> None:
+        """Insert an item before `index`."""
+        self.splice(index, 0, (item,))
+
+    def pop(self, index: int = -1) -> T:
+        """Remove and return the item at `index`."""
+        self._apply_pending_set()
+        item = self._items[index]
+        self.splice(index % len(self._items), 1)
+        return item
+
+    def remove(self, item: T) -> None:
+        """Remove the first occurrence of `item`."""
+        self._apply_pending_set()
+        self.pop(self._items.index(item))
+
+    def move(self, source: int, target: int) -> None:
+        """Move the item at `source` so that it ends up at `target`."""
+        self._apply_pending_set()
+        if not -len(self._items) <= source < len(self._items):
+            raise IndexError("move index out of range")
+        source %= len(self._items)
+        target = slice(target, None).indices(len(self._items))[0]
+        target = min(target, len(self._items) - 1)
+        if source == target:
+            return
+        self._items.insert(target, self._items.pop(source))
+        self._emit(MoveItem(source=source, target=target))
+
+    def clear(self) -> None:
+        """Remove every item from the list."""
+        self._apply_pending_set()
+        self.splice(0, len(self._items))
+
+
+def _derive_items(
+    source: State[Sequence[U]],
+    operator: ListOperator[U, V],
+) -> ReactiveList[V]:
+    """
+    Create a list that follows `source` through an operator.
+
+    Changes of a `ReactiveList` source are translated one by one, while any
+    other source is treated as a `Reset` on every update.
+    """
+    derived = ReactiveList[V]()
+
+    def apply(change: ListChange[U]) -> None:
+        for derived_change in operator.apply(change):
+            derived._apply_change(derived_change)
+
+    if isinstance(source, ReactiveList):
+        source.watch_changes(apply)
+    else:
+        source.watch(lambda items: apply(Reset(items=tuple(items))))
+    return derived
@@ -1,5 +1,5 @@
-from .state import State, MutableState
+from .state import State, MutableState, QtScheduler
 from .style import qss
 from .factory import container
 
-__all__ = ["State", "MutableState", "qss", "container"]
+__all__ = ["State", "MutableState", "QtScheduler", "qss", "container"]
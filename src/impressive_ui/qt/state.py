@@ -1,6 +1,10 @@
+import threading
 from collections.abc import Callable
 from typing import Any, Generic, TypeVar, TYPE_CHECKING
-from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtCore import QCoreApplication, QObject, Qt, Signal, Slot
+
+from impressive_ui.core import WriteBatch
+from impressive_ui.core import state as core
 
 if TYPE_CHECKING:
     from impressive_ui.abc.state import (
@@ -9,7 +13,6 @@ if TYPE_CHECKING:
     )
 
 T = TypeVar("T")
-U = TypeVar("U")
 
 
 class QtStateObject(QObject, Generic[T]):
@@ -35,46 +38,86 @@ class QtStateObject(QObject, Generic[T]):
             self.valueChanged.emit(new_value)
 
 
-class State(Generic[T]):
-    def __init__(self, initial_value: T) -> None:
-        self._obj = QtStateObject(initial_value)
+class QtInvoker(QObject):
+    """
+    Call callbacks on the thread of the Qt application, from any thread.
 
-    def get(self) -> T:
-        return self._obj.value
+    Callbacks are sent through a queued connection, which posts an event to
+    the application thread whether or not the calling thread runs a Qt event
+    loop.
+    """
+
+    called = Signal(object)
+
+    def __init__(self) -> None:
+        super().__init__()
+        application = QCoreApplication.instance()
+        if application is not None:
+            self.moveToThread(application.thread())
+        self.called.connect(self._call, Qt.ConnectionType.QueuedConnection)
+
+    @Slot(object)
+    def _call(self, callback: Callable[[], Any]) -> None:
+        callback()
 
-    @property
-    def value(self) -> T:
-        """
-        The current state value.
-        This property is used to access the value of the state.
-        """
-        return self._obj.value
 
-    def watch(self, callback: Callable[[T], Any]) -> Callable[[], None]:
-        callback(self._obj.value)  # Call immediately with current value
-        self._obj.valueChanged.connect(callback)
+_invoker: QtInvoker | None = None
+_invoker_lock = threading.Lock()
 
-        def disconnect_callback() -> None:
-            self._obj.valueChanged.disconnect(callback)
 
-        return disconnect_callback
+def _get_invoker() -> QtInvoker:
+    """Get the shared invoker, creating it once even when threads race."""
+    global _invoker
+    if _invoker is None:
+        with _invoker_lock:
+            if _invoker is None:
+                _invoker = QtInvoker()
+    return _invoker
 
-    def map(self, mapper: Callable[[T], U], /) -> "State[U]":
-        derived = MutableState(mapper(self._obj.value))
-        self.watch(lambda v: derived.set(mapper(v)))
-        return derived
+
+class QtScheduler:
+    """Call callbacks from the Qt event loop, from any thread."""
+
+    def call_soon(self, callback: Callable[[], Any]) -> None:
+        _get_invoker().called.emit(callback)
+
+
+# Pending writes of every mutable state, applied together by one queued call
+_writes = WriteBatch(QtScheduler())
+
+
+class State(core.State[T]):
+    def __init__(self, initial_value: T) -> None:
+        super().__init__(initial_value, QtScheduler())
+        self._obj = QtStateObject(initial_value)
+        self._obj.valueChanged.connect(self._on_value_changed)
+
+    def _on_value_changed(self, value: T) -> None:
+        core.State._assign(self, value)
+
+    def _assign(self, value: T) -> None:
+        # The state object only emits when the value is not equal
+        self._obj.value = value
+
+    def _derive(self) -> "MutableState[Any]":
+        return MutableState(None)
 
 
 if TYPE_CHECKING:
     check_state_impl(State)
 
 
-class MutableState(State[T]):
+class MutableState(State[T], core.MutableState[T]):
     def set(self, value: T) -> None:
-        QTimer.singleShot(0, lambda: setattr(self._obj, "value", value))
+        """
+        Set a new value from any thread.
 
-    def update(self, updater: Callable[[T], T]) -> None:
-        self.set(updater(self._obj.value))
+        The value is applied on the thread of the Qt application. Writes made
+        before then are coalesced, so only the latest value is applied and
+        watchers are notified once, and the writes to all states share one
+        queued call.
+        """
+        _writes.write(self, self._assign, value)
 
 
 if TYPE_CHECKING:
@@ -1,12 +1,53 @@
-from .diff import diff_update
+from .diff import (
+    CompactOperations,
+    DiffPlan,
+    compute_diff_plan,
+    diff_update,
+    diff_update_keyed,
+    iter_apply_diff_plan,
+    iter_diff_update,
+    iter_diff_update_keyed,
+)
 from .dispatchers import (
+    clear_container,
+    has_implementation,
     insert_widget,
+    insert_widget_after,
+    insert_widgets,
+    move_widget,
+    move_widget_after,
+    move_widgets,
     remove_widget,
+    remove_widgets,
+    set_sort_key,
+    sort_container,
 )
+from .splice import ListChange, MoveItem, Reset, Splice
 
 
 __all__ = [
+    "CompactOperations",
+    "DiffPlan",
+    "ListChange",
+    "MoveItem",
+    "Reset",
+    "Splice",
+    "clear_container",
+    "compute_diff_plan",
     "diff_update",
+    "diff_update_keyed",
+    "has_implementation",
     "insert_widget",
+    "insert_widget_after",
+    "insert_widgets",
+    "iter_apply_diff_plan",
+    "iter_diff_update",
+    "iter_diff_update_keyed",
+    "move_widget",
+    "move_widget_after",
+    "move_widgets",
     "remove_widget",
+    "remove_widgets",
+    "set_sort_key",
+    "sort_container",
 ]
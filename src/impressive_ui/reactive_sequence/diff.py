@@ -1,6 +1,9 @@
-from collections.abc import Iterator, Mapping, Sequence
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
-from typing import Callable, Generic, TypeVar
+from typing import Callable, Generic, TypeVar, overload
 
 SourceT = TypeVar("SourceT")
 TargetT = TypeVar("TargetT")
@@ -31,7 +34,199 @@ class Move(Generic[KeyT]):
     at: int
 
 
-Operation = Remove[KeyT] | Insert[KeyT] | Move[KeyT]
+@dataclass(frozen=True)
+class Update(Generic[KeyT]):
+    """Update operation for a key whose item changed, from `source` to `at`."""
+
+    key: KeyT
+    source: int
+    at: int
+
+
+Operation = Remove[KeyT] | Insert[KeyT] | Move[KeyT] | Update[KeyT]
+
+
+@dataclass(frozen=True)
+class RemoveRange(Generic[KeyT]):
+    """Remove operation for a contiguous run of keys."""
+
+    keys: tuple[KeyT, ...]
+
+
+@dataclass(frozen=True)
+class InsertRange(Generic[KeyT]):
+    """Insert operation for a contiguous run of keys starting at a position."""
+
+    keys: tuple[KeyT, ...]
+    at: int
+
+
+@dataclass(frozen=True)
+class MoveRange(Generic[KeyT]):
+    """Move operation for a run of keys to sit contiguously from a position."""
+
+    keys: tuple[KeyT, ...]
+    at: int
+
+
+@dataclass(frozen=True)
+class Clear:
+    """Remove operation for every item, ahead of rebuilding the sequence."""
+
+
+RangeOperation = RemoveRange[KeyT] | InsertRange[KeyT] | MoveRange[KeyT] | Clear
+
+
+class CompactOperations(Sequence[Operation[KeyT] | RangeOperation[KeyT]]):
+    """
+    Operations stored in parallel arrays instead of one object each.
+
+    Operation `i` has the opcode `codes[i]`, the keys
+    `keys[offsets[i]:offsets[i + 1]]`, the position `positions[i]` and, for
+    updates, the old index `sources[i]`. A remove, insert or move with a
+    single key is the single-key operation, and with more keys the range
+    one. Indexing and iterating create the equivalent operation dataclasses.
+
+    >>> operations = CompactOperations([Remove(key='a'), InsertRange(keys=('x', 'y'), at=1)])
+    >>> list(operations.codes), operations.keys, list(operations.offsets)
+    ([0, 1], ['a', 'x', 'y'], [0, 1, 3])
+    >>> operations
+    (Remove(key='a'), InsertRange(keys=('x', 'y'), at=1))
+    """
+
+    REMOVE = 0
+    INSERT = 1
+    MOVE = 2
+    UPDATE = 3
+    CLEAR = 4
+
+    __slots__ = ("codes", "keys", "offsets", "positions", "sources")
+
+    def __init__(
+        self, operations: Iterable[Operation[KeyT] | RangeOperation[KeyT]] = ()
+    ) -> None:
+        self.codes = bytearray()
+        self.offsets = array("q", (0,))
+        self.positions = array("q")
+        self.sources = array("q")
+        self.keys: list[KeyT] = []
+        for operation in operations:
+            self.append(operation)
+
+    def add(self, code: int, key: KeyT, at: int = 0, source: int = 0) -> None:
+        """Add an operation on a single key."""
+        self.codes.append(code)
+        self.keys.append(key)
+        self.offsets.append(len(self.keys))
+        self.positions.append(at)
+        self.sources.append(source)
+
+    def add_run(self, code: int, keys: Sequence[KeyT], at: int = 0) -> None:
+        """Add an operation on a run of keys, unless it is empty and not Clear."""
+        if not keys and code != self.CLEAR:
+            return
+        self.codes.append(code)
+        self.keys.extend(keys)
+        self.offsets.append(len(self.keys))
+        self.positions.append(at)
+        self.sources.append(0)
+
+    def append(self, operation: Operation[KeyT] | RangeOperation[KeyT]) -> None:
+        """Add an operation given as a dataclass."""
+        match operation:
+            case Remove(key=key):
+                self.add(self.REMOVE, key)
+            case Insert(key=key, at=at):
+                self.add(self.INSERT, key, at)
+            case Move(key=key, at=at):
+                self.add(self.MOVE, key, at)
+            case Update(key=key, source=source, at=at):
+                self.add(self.UPDATE, key, at, source)
+            case RemoveRange(keys=keys):
+                self.add_run(self.REMOVE, keys)
+            case InsertRange(keys=keys, at=at):
+                self.add_run(self.INSERT, keys, at)
+            case MoveRange(keys=keys, at=at):
+                self.add_run(self.MOVE, keys, at)
+            case Clear():
+                self.add_run(self.CLEAR, ())
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @overload
+    def __getitem__(self, index: int) -> Operation[KeyT] | RangeOperation[KeyT]: ...
+
+    @overload
+    def __getitem__(
+        self, index: slice
+    ) -> tuple[Operation[KeyT] | RangeOperation[KeyT], ...]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> (
+        Operation[KeyT]
+        | RangeOperation[KeyT]
+        | tuple[Operation[KeyT] | RangeOperation[KeyT], ...]
+    ):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+
+        code = self.codes[index]
+        index %= len(self.codes)
+        keys = self.keys[self.offsets[index] : self.offsets[index + 1]]
+        at = self.positions[index]
+        if code == self.CLEAR:
+            return Clear()
+        if code == self.UPDATE:
+            return Update(key=keys[0], source=self.sources[index], at=at)
+        if code == self.REMOVE:
+            return (
+                Remove(key=keys[0]) if len(keys) == 1 else RemoveRange(keys=tuple(keys))
+            )
+        if code == self.INSERT:
+            return (
+                Insert(key=keys[0], at=at)
+                if len(keys) == 1
+                else InsertRange(keys=tuple(keys), at=at)
+            )
+        return (
+            Move(key=keys[0], at=at)
+            if len(keys) == 1
+            else MoveRange(keys=tuple(keys), at=at)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (CompactOperations, tuple, list)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(tuple(self))
+
+
+@dataclass(frozen=True)
+class DiffPlan(Generic[KeyT]):
+    """
+    Operations that turn one key sequence into another.
+
+    Only the old keys in `start:stop` are touched by the structural
+    operations; the keys before and after that window stay in place.
+    `rebuild` tells whether the plan clears the container and builds every
+    item again instead of diffing. Operations given as dataclasses are
+    stored as `CompactOperations`.
+    """
+
+    start: int
+    stop: int
+    operations: CompactOperations[KeyT]
+    rebuild: bool = False
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.operations, CompactOperations):
+            object.__setattr__(self, "operations", CompactOperations(self.operations))
 
 
 def longest_increasing_subsequence_indices(arr: Sequence[int]) -> Sequence[int]:
@@ -48,21 +243,33 @@ def longest_increasing_subsequence_indices(arr: Sequence[int]) -> Sequence[int]:
     if not arr:
         return []
 
-    n = len(arr)
-    dp = [1] * n
-    parent = [-1] * n
+    # Patience sorting: ``tails[p]`` is the smallest value ending an increasing
+    # subsequence of length ``p + 1``. Each pile keeps the (negated) values and
+    # indices that landed on it; values within a pile never increase, so the
+    # earliest valid predecessor can be found by binary search. Picking the
+    # earliest predecessor and the earliest longest end keeps the result
+    # identical to the naive dynamic programming formulation.
+    tails: list[int] = []
+    pile_values: list[list[int]] = []
+    pile_indices: list[list[int]] = []
+    parent = [-1] * len(arr)
 
-    for i in range(1, n):
-        for j in range(i):
-            if arr[j] < arr[i] and dp[j] + 1 > dp[i]:
-                dp[i] = dp[j] + 1
-                parent[i] = j
-
-    max_length = max(dp)
-    end_pos = dp.index(max_length)
+    for i, value in enumerate(arr):
+        pos = bisect_left(tails, value)
+        if pos > 0:
+            previous = pile_indices[pos - 1]
+            parent[i] = previous[bisect_right(pile_values[pos - 1], -value)]
+        if pos == len(tails):
+            tails.append(value)
+            pile_values.append([-value])
+            pile_indices.append([i])
+        else:
+            tails[pos] = value
+            pile_values[pos].append(-value)
+            pile_indices[pos].append(i)
 
     lis_indices = []
-    current = end_pos
+    current = pile_indices[-1][0]
     while current != -1:
         lis_indices.append(current)
         current = parent[current]
@@ -70,12 +277,417 @@ def longest_increasing_subsequence_indices(arr: Sequence[int]) -> Sequence[int]:
     return list(reversed(lis_indices))
 
 
+def common_affix_lengths(
+    old_keys: Sequence[KeyT], new_keys: Sequence[KeyT]
+) -> tuple[int, int]:
+    """
+    Return the lengths of the common prefix and suffix of two key sequences.
+
+    The prefix and suffix never overlap, so the changed windows are
+    ``old_keys[prefix:len(old_keys) - suffix]`` and
+    ``new_keys[prefix:len(new_keys) - suffix]``.
+
+    >>> common_affix_lengths(['a', 'b', 'c'], ['a', 'b', 'c', 'd'])
+    (3, 0)
+    >>> common_affix_lengths(['a', 'b', 'c'], ['a', 'x', 'c'])
+    (1, 1)
+    >>> common_affix_lengths(['a', 'b'], ['b', 'a'])
+    (0, 0)
+    """
+    limit = min(len(old_keys), len(new_keys))
+    prefix = 0
+    while prefix < limit and old_keys[prefix] == new_keys[prefix]:
+        prefix += 1
+
+    limit -= prefix
+    suffix = 0
+    while suffix < limit and old_keys[-1 - suffix] == new_keys[-1 - suffix]:
+        suffix += 1
+
+    return prefix, suffix
+
+
+def changed_runs(
+    old_items: Sequence[SourceT], new_items: Sequence[SourceT]
+) -> Iterator[tuple[int, int]]:
+    """
+    Yield the ``(start, stop)`` runs where two aligned sequences differ.
+
+    Items that are the same object or compare equal are unchanged, so items
+    that keep their key but are edited can be refreshed in place.
+
+    >>> old = [(1, 'a'), (2, 'b'), (3, 'c'), (4, 'd')]
+    >>> list(changed_runs(old, [(1, 'A'), (2, 'b'), (3, 'C'), (4, 'D')]))
+    [(0, 1), (2, 4)]
+    >>> list(changed_runs(old, old))
+    []
+    """
+    start = None
+    for index, (old, new) in enumerate(zip(old_items, new_items)):
+        if old is new or old == new:
+            if start is not None:
+                yield start, index
+                start = None
+        elif start is None:
+            start = index
+    if start is not None:
+        yield start, min(len(old_items), len(new_items))
+
+
+def myers_matches(
+    old: Sequence[SourceT], new: Sequence[SourceT], max_cost: int = 256
+) -> list[tuple[int, int]]:
+    """
+    Match equal items of two sequences with Myers' O(ND) diff.
+
+    Returns the index pairs of a longest common subsequence, in order. Items
+    are compared by their hash first, so each item is only hashed once. When
+    the changed window needs more than `max_cost` removals and insertions,
+    none of its items are matched. Windows whose item hashes alone show that
+    are not traced at all.
+
+    >>> myers_matches('abcabba', 'cbabac')
+    [(2, 0), (3, 2), (4, 3), (6, 4)]
+    >>> myers_matches(['x', 'y'], ['x', 'y'])
+    [(0, 0), (1, 1)]
+    """
+    prefix, suffix = common_affix_lengths(old, new)
+    matches = [(i, i) for i in range(prefix)]
+    a = old[prefix : len(old) - suffix]
+    b = new[prefix : len(new) - suffix]
+    n, m = len(a), len(b)
+    hash_a = [hash(item) for item in a]
+    hash_b = [hash(item) for item in b]
+
+    # Every hash found more often in one window than in the other costs at
+    # least one removal or insertion, which is cheap to count up front
+    counts_a, counts_b = Counter(hash_a), Counter(hash_b)
+    unmatched = sum((counts_a - counts_b).values()) + sum(
+        (counts_b - counts_a).values()
+    )
+
+    # Greedy forward pass: v[k] is the furthest x reached on diagonal k, and
+    # the trace keeps v as it was before each round for the backtrack
+    v = {1: 0}
+    trace = []
+    end = None
+    rounds = min(n + m, max_cost) + 1 if unmatched <= max_cost else 0
+    for d in range(rounds):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and hash_a[x] == hash_b[y] and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                end = d
+                break
+        if end is not None:
+            break
+
+    window = []
+    if end is not None:
+        x, y = n, m
+        for d in range(end, -1, -1):
+            k = x - y
+            previous = trace[d]
+            if d == 0:
+                previous_x = previous_y = 0
+            else:
+                if k == -d or (k != d and previous[k - 1] < previous[k + 1]):
+                    previous_k = k + 1
+                else:
+                    previous_k = k - 1
+                previous_x = previous[previous_k]
+                previous_y = previous_x - previous_k
+            while x > previous_x and y > previous_y:
+                x -= 1
+                y -= 1
+                window.append((prefix + x, prefix + y))
+            x, y = previous_x, previous_y
+        window.reverse()
+
+    matches.extend(window)
+    matches.extend(
+        (len(old) - suffix + i, len(new) - suffix + i) for i in range(suffix)
+    )
+    return matches
+
+
+def value_keys(
+    old: Sequence[SourceT], new: Sequence[SourceT]
+) -> tuple[list[int], list[int]]:
+    """
+    Key the items of two sequences so that items matched by value share a key.
+
+    Old items are keyed by their index. New items take the key of the old
+    item they are matched with by `myers_matches`, and a fresh key otherwise,
+    so a keyed diff of the result only removes and inserts.
+
+    >>> value_keys(['a', 'b', 'c'], ['a', 'c', 'd'])
+    ([0, 1, 2], [0, 2, 5])
+    """
+    new_keys = [len(old) + j for j in range(len(new))]
+    for i, j in myers_matches(old, new):
+        new_keys[j] = i
+    return list(range(len(old))), new_keys
+
+
+def _runs(flags: Sequence[bool]) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, stop)`` for every run of consecutive true flags."""
+    start = None
+    for i, flag in enumerate(flags):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            yield start, i
+            start = None
+    if start is not None:
+        yield start, len(flags)
+
+
+def _add_window_operations(
+    operations: CompactOperations[KeyT],
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    offset: int,
+    coalesce: bool = False,
+) -> None:
+    """
+    Add the operations for the changed window of a sequence.
+
+    `old_keys` and `new_keys` are the keys between the common prefix and
+    suffix, and `offset` is the length of the common prefix. With `coalesce`,
+    contiguous runs are added as range operations.
+    """
+    add, add_run = operations.add, operations.add_run
+    REMOVE, INSERT, MOVE = (
+        CompactOperations.REMOVE,
+        CompactOperations.INSERT,
+        CompactOperations.MOVE,
+    )
+
+    if not old_keys and not new_keys:
+        return
+    if not old_keys or not new_keys:
+        if not coalesce:
+            for key in old_keys:
+                add(REMOVE, key)
+            for i, key in enumerate(new_keys, offset):
+                add(INSERT, key, i)
+        elif old_keys:
+            add_run(REMOVE, old_keys)
+        else:
+            add_run(INSERT, new_keys, offset)
+        return
+
+    old_key_set = set(old_keys)
+    new_key_set = set(new_keys)
+
+    # 1. Remove deleted items first, in their old order
+    removed = [key not in new_key_set for key in old_keys]
+    for start, stop in _runs(removed):
+        if coalesce:
+            add_run(REMOVE, old_keys[start:stop])
+        else:
+            for key in old_keys[start:stop]:
+                add(REMOVE, key)
+
+    # Keys present on both sides, with their rank in the old order
+    old_rank = {
+        key: rank
+        for rank, key in enumerate(key for key in old_keys if key in new_key_set)
+    }
+    common_keys = [key for key in new_keys if key in old_rank]
+    ranks = [old_rank[key] for key in common_keys]
+
+    # Find LIS to determine which items can stay in place
+    kept = [False] * len(ranks)
+    for i in longest_increasing_subsequence_indices(ranks):
+        kept[i] = True
+
+    # 2. Handle moves from the back so each one lands right before its new
+    # successor. A move's position has to account for the moved items that
+    # still sit after that successor's anchor (the next kept item), which is
+    # counted with a Fenwick tree over old ranks. Consecutive moved items end
+    # up next to each other, so with `coalesce` each run is a single move.
+    if len(kept) > sum(kept):
+        tree = _RankCounter(len(ranks))
+        for rank, keep in zip(ranks, kept):
+            if not keep:
+                tree.add(rank, 1)
+
+        anchor = len(ranks)
+        position = len(ranks) - 1
+        while position >= 0:
+            if kept[position]:
+                anchor = ranks[position]
+                position -= 1
+                continue
+
+            stop = position + 1
+            while position >= 0 and not kept[position]:
+                tree.add(ranks[position], -1)
+                if not coalesce:
+                    at = position - tree.count_above(anchor)
+                    add(MOVE, common_keys[position], offset + at)
+                position -= 1
+
+            if coalesce:
+                start = position + 1
+                at = start - tree.count_above(anchor)
+                add_run(MOVE, common_keys[start:stop], offset + at)
+
+    # 3. Then handle inserts in forward order
+    inserted = [key not in old_key_set for key in new_keys]
+    for start, stop in _runs(inserted):
+        if coalesce:
+            add_run(INSERT, new_keys[start:stop], offset + start)
+        else:
+            for i in range(start, stop):
+                add(INSERT, new_keys[i], offset + i)
+
+
+class _RankCounter:
+    """Fenwick tree counting the ranks that are still present."""
+
+    def __init__(self, size: int) -> None:
+        self._tree = [0] * (size + 1)
+        self._total = 0
+
+    def add(self, rank: int, delta: int) -> None:
+        self._total += delta
+        i = rank + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def count_above(self, rank: int) -> int:
+        """Count present ranks strictly greater than `rank`."""
+        count = 0
+        i = min(rank + 1, len(self._tree) - 1)
+        while i > 0:
+            count += self._tree[i]
+            i -= i & -i
+        return self._total - count
+
+
+def compute_key_operations(
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    *,
+    coalesce: bool = False,
+) -> Iterator[Operation[KeyT] | RangeOperation[KeyT]]:
+    """
+    Compute minimal operations to turn `old_keys` into `new_keys`.
+
+    The common prefix and suffix are skipped, so only the changed window is
+    run through the keyed LIS diff. Removes come first, then moves from the
+    back, then inserts from the front; each position is valid at the time the
+    operation is applied. With `coalesce`, contiguous runs are merged into
+    `RemoveRange`, `MoveRange` and `InsertRange` operations.
+
+    >>> list(compute_key_operations(['a', 'b', 'c'], ['a', 'b', 'c', 'd', 'e']))
+    [Insert(key='d', at=3), Insert(key='e', at=4)]
+    >>> list(compute_key_operations(['a', 'b', 'c', 'd'], ['a', 'c', 'd']))
+    [Remove(key='b')]
+    >>> list(compute_key_operations(['a', 'b', 'c'], ['b', 'x', 'y', 'a', 'c']))
+    [Move(key='a', at=1), Insert(key='x', at=1), Insert(key='y', at=2)]
+    >>> list(compute_key_operations(['a', 'b', 'c'], ['a', 'x', 'y', 'z'], coalesce=True))
+    [RemoveRange(keys=('b', 'c')), InsertRange(keys=('x', 'y', 'z'), at=1)]
+    >>> list(compute_key_operations(['a', 'b', 'c', 'd'], ['c', 'd', 'a', 'b'], coalesce=True))
+    [MoveRange(keys=('a', 'b'), at=2)]
+    >>> list(compute_key_operations(['a', 'b', 'c'], ['a', 'b', 'c'], coalesce=True))
+    []
+    """
+    prefix, suffix = common_affix_lengths(old_keys, new_keys)
+    operations = CompactOperations()
+    _add_window_operations(
+        operations,
+        old_keys[prefix : len(old_keys) - suffix],
+        new_keys[prefix : len(new_keys) - suffix],
+        prefix,
+        coalesce,
+    )
+    return iter(operations)
+
+
+def compute_update_operations(
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    old_source: Sequence[SourceT],
+    new_source: Sequence[SourceT],
+) -> Iterator[Operation[KeyT] | RangeOperation[KeyT]]:
+    """
+    Compute update operations for keys that are kept but whose item changed.
+
+    An item changed when the old and new items are different objects that
+    do not compare equal.
+
+    >>> old = [('a', 1), ('b', 2), ('c', 3)]
+    >>> new = [('c', 3), ('a', 10), ('d', 4)]
+    >>> list(compute_update_operations(['a', 'b', 'c'], ['c', 'a', 'd'], old, new))
+    [Update(key='a', source=0, at=1)]
+    """
+    operations: CompactOperations[KeyT] = CompactOperations()
+    _add_update_operations(operations, old_keys, new_keys, old_source, new_source)
+    return iter(operations)
+
+
+def _add_update_operations(
+    operations: CompactOperations[KeyT],
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    old_source: Sequence[SourceT],
+    new_source: Sequence[SourceT],
+    prefix: int | None = None,
+    suffix: int | None = None,
+) -> None:
+    """
+    Add the update operations of `compute_update_operations`.
+
+    Keys in the common prefix and suffix sit at known old positions, so only
+    the keys of the changed window are looked up in an index.
+    """
+    if prefix is None or suffix is None:
+        prefix, suffix = common_affix_lengths(old_keys, new_keys)
+    old_stop, new_stop = len(old_keys) - suffix, len(new_keys) - suffix
+    add, UPDATE = operations.add, CompactOperations.UPDATE
+
+    for start, stop in changed_runs(old_source[:prefix], new_source[:prefix]):
+        for at in range(start, stop):
+            add(UPDATE, new_keys[at], at, at)
+
+    old_index = {key: i for i, key in enumerate(old_keys[prefix:old_stop], prefix)}
+    for at in range(prefix, new_stop):
+        i = old_index.get(new_keys[at])
+        if i is None:
+            continue
+        old_item, new_item = old_source[i], new_source[at]
+        if old_item is not new_item and old_item != new_item:
+            add(UPDATE, new_keys[at], at, i)
+
+    for start, stop in changed_runs(old_source[old_stop:], new_source[new_stop:]):
+        for offset in range(start, stop):
+            add(
+                UPDATE,
+                new_keys[new_stop + offset],
+                new_stop + offset,
+                old_stop + offset,
+            )
+
+
 def compute_diff_operations(
     old_key_to_index: Mapping[KeyT, int],
     new_key_to_index: Mapping[KeyT, int],
     new_sequence: Sequence[SourceT],
     key_func: Callable[[SourceT], KeyT],
-) -> Iterator[Operation[KeyT]]:
+) -> Iterator[Operation[KeyT] | RangeOperation[KeyT]]:
     """
     Compute minimal operations using Longest Common Subsequence approach.
 
@@ -94,48 +706,59 @@ def compute_diff_operations(
     [Move(key='b', at=2), Move(key='c', at=1)]
 
     """
-    # Find the longest increasing subsequence of positions for items that exist in both
-    common_items = [item for item in new_sequence if key_func(item) in old_key_to_index]
-    old_positions = [old_key_to_index[key_func(item)] for item in common_items]
+    old_keys = sorted(old_key_to_index, key=old_key_to_index.__getitem__)
+    new_keys = [key_func(item) for item in new_sequence]
+    return compute_key_operations(old_keys, new_keys)
 
-    # Find LIS to determine which items can stay in place
-    lis_indices = longest_increasing_subsequence_indices(old_positions)
-    items_to_keep = {key_func(common_items[i]) for i in lis_indices}
-
-    # Separate keys into different categories
-    deleted_keys = {key for key in old_key_to_index if key not in new_key_to_index}
-    moved_keys = {
-        key
-        for key in old_key_to_index
-        if key in new_key_to_index and key not in items_to_keep
-    }
-    new_keys_only = {key for key in new_key_to_index if key not in old_key_to_index}
-
-    # 1. Remove deleted items first
-    yield from (Remove(key=key) for key in deleted_keys)
 
-    # 2. Handle moves first (reverse order to avoid position shifts)
-    moves = [Move(key=key, at=new_key_to_index[key]) for key in moved_keys]
-    yield from sorted(moves, key=lambda op: op.at, reverse=True)
-
-    # 3. Then handle inserts in forward order
-    inserts = [Insert(key=key, at=new_key_to_index[key]) for key in new_keys_only]
-    yield from sorted(inserts, key=lambda op: op.at)
+def _source_keys(
+    old_source: Sequence[SourceT],
+    new_source: Sequence[SourceT],
+    key_func: Callable[[SourceT], KeyT] | None,
+) -> tuple[list[KeyT], list[KeyT]] | tuple[list[int], list[int]]:
+    """Key both sources with `key_func`, or by value when it is None."""
+    if key_func is None:
+        return value_keys(old_source, new_source)
+    return [key_func(item) for item in old_source], [
+        key_func(item) for item in new_source
+    ]
 
 
 def diff_update(
     container: ContainerT,
     old_source: Sequence[SourceT],
     new_source: Sequence[SourceT],
-    key_func: Callable[[SourceT], KeyT],
+    key_func: Callable[[SourceT], KeyT] | None,
     factory: Callable[[SourceT], TargetT],
     remove: Callable[[ContainerT, TargetT], None],
     insert: Callable[[ContainerT, TargetT, int], None],
     get_container_items: Callable[[ContainerT], Sequence[TargetT]],
+    remove_range: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    insert_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    move: Callable[[ContainerT, TargetT, int], None] | None = None,
+    move_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    update: Callable[[ContainerT, TargetT, SourceT, SourceT], None] | None = None,
+    clear: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    rebuild_threshold: float | None = None,
 ) -> None:
     """
     Apply minimal diff updates to transform container from old_source to new_source state.
 
+    When `remove_range` or `insert_range` is given, contiguous runs are
+    applied with a single call instead of one `remove`/`insert` per item.
+    When `move` or `move_range` is given, moved items are reordered in place
+    instead of being removed and inserted again. When `update` is given,
+    items that keep their key but changed are passed to
+    `update(container, target, old_item, new_item)` instead of being left
+    as they are.
+    When more than `rebuild_threshold` of the items would be removed or
+    inserted, the container is cleared with `clear` and rebuilt instead, see
+    `compute_diff_plan`.
+
+    With `key_func=None`, hashable items are matched by value with
+    `myers_matches`, so equal items keep their targets and the rest are only
+    removed and inserted.
+
     >>> container = []
     >>> factory = lambda x: x.upper()
     >>> key_func = lambda x: x
@@ -159,42 +782,463 @@ def diff_update(
     >>> diff_update(container, old_source, new_source, key_func, factory, remove, insert, get_container_items)
     >>> container
     ['D', 'C', 'B']
+
+    # test range insert, from d c b to d c b e f g
+    >>> calls = []
+    >>> def insert_range(c, items, at):
+    ...     calls.append(len(items))
+    ...     c[at:at] = items
+    >>> old_source = list(new_source)
+    >>> new_source = ['d', 'c', 'b', 'e', 'f', 'g']
+    >>> diff_update(container, old_source, new_source, key_func, factory, remove, insert, get_container_items, insert_range=insert_range)
+    >>> container, calls
+    (['D', 'C', 'B', 'E', 'F', 'G'], [3])
+
+    # test in-place move, from d c b e f g to g d c b e f
+    >>> moves = []
+    >>> def move(c, item, at):
+    ...     moves.append(item)
+    ...     c.insert(at, c.pop(c.index(item)))
+    >>> old_source = list(new_source)
+    >>> new_source = ['g', 'd', 'c', 'b', 'e', 'f']
+    >>> diff_update(container, old_source, new_source, key_func, factory, remove, insert, get_container_items, move=move)
+    >>> container, moves
+    (['G', 'D', 'C', 'B', 'E', 'F'], ['G'])
+
+    # test in-place update, keyed by the first letter
+    >>> def update(c, item, old, new):
+    ...     c[c.index(item)] = new.upper()
+    >>> old_source = list(new_source)
+    >>> new_source = ['g', 'd', 'c2', 'b', 'e', 'f']
+    >>> diff_update(container, old_source, new_source, lambda x: x[0], factory, remove, insert, get_container_items, update=update)
+    >>> container
+    ['G', 'D', 'C2', 'B', 'E', 'F']
+
+    # test rebuild, from g d c2 b e f to x y z
+    >>> cleared = []
+    >>> def clear(c, items):
+    ...     cleared.append(len(items))
+    ...     c.clear()
+    >>> old_source = list(new_source)
+    >>> new_source = ['x', 'y', 'z']
+    >>> diff_update(container, old_source, new_source, key_func, factory, remove, insert, get_container_items, clear=clear, rebuild_threshold=0.8)
+    >>> container, cleared
+    (['X', 'Y', 'Z'], [6])
+
+    # test value diff without keys, from x y z to x z x z
+    >>> old_source = list(new_source)
+    >>> new_source = ['x', 'z', 'x', 'z']
+    >>> diff_update(container, old_source, new_source, None, factory, remove, insert, get_container_items)
+    >>> container
+    ['X', 'Z', 'X', 'Z']
+    """
+    old_keys, new_keys = _source_keys(old_source, new_source, key_func)
+    diff_update_keyed(
+        container,
+        old_keys,
+        new_keys,
+        new_source,
+        lambda _key, item: factory(item),
+        remove,
+        insert,
+        get_container_items,
+        remove_range,
+        insert_range,
+        move,
+        move_range,
+        old_source,
+        update,
+        clear,
+        rebuild_threshold,
+    )
+
+
+def iter_diff_update(
+    container: ContainerT,
+    old_source: Sequence[SourceT],
+    new_source: Sequence[SourceT],
+    key_func: Callable[[SourceT], KeyT] | None,
+    factory: Callable[[SourceT], TargetT],
+    remove: Callable[[ContainerT, TargetT], None],
+    insert: Callable[[ContainerT, TargetT, int], None],
+    get_container_items: Callable[[ContainerT], Sequence[TargetT]],
+    remove_range: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    insert_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    move: Callable[[ContainerT, TargetT, int], None] | None = None,
+    move_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    update: Callable[[ContainerT, TargetT, SourceT, SourceT], None] | None = None,
+    clear: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    rebuild_threshold: float | None = None,
+) -> Iterator[None]:
+    """
+    Like `diff_update`, but apply the operations one step at a time.
+
+    See `iter_diff_update_keyed`.
+    """
+    old_keys, new_keys = _source_keys(old_source, new_source, key_func)
+    return iter_diff_update_keyed(
+        container,
+        old_keys,
+        new_keys,
+        new_source,
+        lambda _key, item: factory(item),
+        remove,
+        insert,
+        get_container_items,
+        remove_range,
+        insert_range,
+        move,
+        move_range,
+        old_source,
+        update,
+        clear,
+        rebuild_threshold,
+    )
+
+
+def diff_update_keyed(
+    container: ContainerT,
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    new_source: Sequence[SourceT],
+    factory: Callable[[KeyT, SourceT], TargetT],
+    remove: Callable[[ContainerT, TargetT], None],
+    insert: Callable[[ContainerT, TargetT, int], None],
+    get_container_items: Callable[[ContainerT], Sequence[TargetT]],
+    remove_range: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    insert_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    move: Callable[[ContainerT, TargetT, int], None] | None = None,
+    move_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    old_source: Sequence[SourceT] | None = None,
+    update: Callable[[ContainerT, TargetT, SourceT, SourceT], None] | None = None,
+    clear: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    rebuild_threshold: float | None = None,
+) -> None:
+    """
+    Like `diff_update`, but for sequences whose keys are already computed.
+
+    `old_keys` and `new_keys` are the keys of the old and new source items in
+    order, so callers that keep the keys from the previous update only compute
+    each new key once. `factory` receives the key along with the source item.
+    Updates need the `old_source` items to compare against, and are applied
+    once the container is in its new order.
+
+    >>> container = ['A', 'B', 'C']
+    >>> factory = lambda key, x: f'{key}:{x}'
+    >>> remove = lambda c, item: c.remove(item)
+    >>> insert = lambda c, item, at: c.insert(at, item)
+    >>> get_container_items = lambda c: c
+    >>> diff_update_keyed(container, ['a', 'b', 'c'], ['c', 'a', 'd'], ['C', 'A', 'D'], factory, remove, insert, get_container_items)
+    >>> container
+    ['C', 'A', 'd:D']
+    """
+    for _ in iter_diff_update_keyed(
+        container,
+        old_keys,
+        new_keys,
+        new_source,
+        factory,
+        remove,
+        insert,
+        get_container_items,
+        remove_range,
+        insert_range,
+        move,
+        move_range,
+        old_source,
+        update,
+        clear,
+        rebuild_threshold,
+    ):
+        pass
+
+
+def iter_diff_update_keyed(
+    container: ContainerT,
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    new_source: Sequence[SourceT],
+    factory: Callable[[KeyT, SourceT], TargetT],
+    remove: Callable[[ContainerT, TargetT], None],
+    insert: Callable[[ContainerT, TargetT, int], None],
+    get_container_items: Callable[[ContainerT], Sequence[TargetT]],
+    remove_range: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    insert_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    move: Callable[[ContainerT, TargetT, int], None] | None = None,
+    move_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    old_source: Sequence[SourceT] | None = None,
+    update: Callable[[ContainerT, TargetT, SourceT, SourceT], None] | None = None,
+    clear: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    rebuild_threshold: float | None = None,
+) -> Iterator[None]:
+    """
+    Like `diff_update_keyed`, but apply the operations one step at a time.
+
+    Each step applies one operation and yields, so callers can spread a large
+    update over several main loop iterations. Positions assume every earlier
+    step was applied, and the container only matches `new_source` once the
+    iterator is exhausted. An unfinished iterator can simply be dropped.
+
+    >>> container = ['A', 'B', 'C']
+    >>> factory = lambda key, x: x
+    >>> remove = lambda c, item: c.remove(item)
+    >>> insert = lambda c, item, at: c.insert(at, item)
+    >>> steps = iter_diff_update_keyed(container, ['a', 'b', 'c'], ['c', 'x', 'a'], ['C', 'X', 'A'], factory, remove, insert, lambda c: c)
+    >>> next(steps)
+    >>> container
+    ['A', 'C']
+    >>> for _ in steps:
+    ...     pass
+    >>> container
+    ['C', 'X', 'A']
+    """
+    coalesce = any(
+        callback is not None for callback in (remove_range, insert_range, move_range)
+    )
+    plan = compute_diff_plan(
+        old_keys,
+        new_keys,
+        coalesce=coalesce,
+        old_source=old_source if update is not None else None,
+        new_source=new_source,
+        rebuild_threshold=rebuild_threshold,
+    )
+    return iter_apply_diff_plan(
+        container,
+        plan,
+        old_keys,
+        new_source,
+        factory,
+        remove,
+        insert,
+        get_container_items,
+        remove_range,
+        insert_range,
+        move,
+        move_range,
+        old_source,
+        update,
+        clear,
+    )
+
+
+def churn_ratio(old_keys: Sequence[KeyT], new_keys: Sequence[KeyT]) -> float:
+    """
+    Return the share of items that are removed or inserted rather than kept.
+
+    >>> churn_ratio(['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'x'])
+    0.25
+    >>> churn_ratio(['a', 'b'], ['x', 'y', 'z'])
+    1.0
+    """
+    total = len(old_keys) + len(new_keys)
+    if not total:
+        return 0.0
+    kept = len(set(old_keys).intersection(new_keys))
+    return 1 - 2 * kept / total
+
+
+def compute_diff_plan(
+    old_keys: Sequence[KeyT],
+    new_keys: Sequence[KeyT],
+    *,
+    coalesce: bool = False,
+    old_source: Sequence[SourceT] | None = None,
+    new_source: Sequence[SourceT] | None = None,
+    rebuild_threshold: float | None = None,
+) -> DiffPlan[KeyT]:
+    """
+    Compute every operation needed to turn `old_keys` into `new_keys`.
+
+    Update operations are included when both `old_source` and `new_source`
+    are given. The plan only depends on its arguments, so it can be computed
+    away from the main thread and applied later with `iter_apply_diff_plan`.
+
+    When the `churn_ratio` of the keys exceeds `rebuild_threshold`, a diff
+    would mostly remove and insert items one by one, so the plan clears the
+    container and inserts every new item instead.
+
+    >>> compute_diff_plan(['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'])
+    DiffPlan(start=1, stop=3, operations=(Move(key='b', at=2),), rebuild=False)
+    >>> compute_diff_plan(['a', 'b', 'c'], ['x', 'y', 'a'], coalesce=True, rebuild_threshold=0.5)
+    DiffPlan(start=0, stop=3, operations=(Clear(), InsertRange(keys=('x', 'y', 'a'), at=0)), rebuild=True)
+    >>> compute_diff_plan(['a', 'b'], [], coalesce=True, rebuild_threshold=0.5).operations
+    (Clear(),)
+    >>> compute_diff_plan(['a', 'b'], ['a', 'b'], coalesce=True).operations
+    ()
     """
-    # Create mappings once
-    old_key_to_index = {key_func(item): i for i, item in enumerate(old_source)}
-    new_key_to_index = {key_func(item): i for i, item in enumerate(new_source)}
-    new_key_to_item = {key_func(item): item for item in new_source}
+    if (
+        rebuild_threshold is not None
+        and old_keys
+        and churn_ratio(old_keys, new_keys) > rebuild_threshold
+    ):
+        operations = CompactOperations([Clear()])
+        _add_window_operations(operations, (), new_keys, 0, coalesce)
+        return DiffPlan(
+            start=0, stop=len(old_keys), operations=operations, rebuild=True
+        )
+
+    prefix, suffix = common_affix_lengths(old_keys, new_keys)
+    old_stop = len(old_keys) - suffix
+    new_stop = len(new_keys) - suffix
+
+    operations = CompactOperations()
+    if prefix < old_stop or prefix < new_stop:
+        _add_window_operations(
+            operations,
+            old_keys[prefix:old_stop],
+            new_keys[prefix:new_stop],
+            prefix,
+            coalesce,
+        )
+    if old_source is not None and new_source is not None:
+        _add_update_operations(
+            operations, old_keys, new_keys, old_source, new_source, prefix, suffix
+        )
+
+    return DiffPlan(start=prefix, stop=old_stop, operations=operations)
+
+
+def iter_apply_diff_plan(
+    container: ContainerT,
+    plan: DiffPlan[KeyT],
+    old_keys: Sequence[KeyT],
+    new_source: Sequence[SourceT],
+    factory: Callable[[KeyT, SourceT], TargetT],
+    remove: Callable[[ContainerT, TargetT], None],
+    insert: Callable[[ContainerT, TargetT, int], None],
+    get_container_items: Callable[[ContainerT], Sequence[TargetT]],
+    remove_range: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+    insert_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    move: Callable[[ContainerT, TargetT, int], None] | None = None,
+    move_range: Callable[[ContainerT, Sequence[TargetT], int], None] | None = None,
+    old_source: Sequence[SourceT] | None = None,
+    update: Callable[[ContainerT, TargetT, SourceT, SourceT], None] | None = None,
+    clear: Callable[[ContainerT, Sequence[TargetT]], None] | None = None,
+) -> Iterator[None]:
+    """
+    Apply a plan from `compute_diff_plan` one operation per step.
 
-    # Create mapping from old keys to actual container items
+    `old_keys` must be the keys the plan was computed from, in the order the
+    container currently holds them. `clear` receives every item of the
+    container, and defaults to removing them as a range. Plans with Update
+    operations also need `old_source` and `update`.
+
+    >>> plan = compute_diff_plan(['a'], ['a'], old_source=[1], new_source=[2])
+    >>> plan.operations
+    (Update(key='a', source=0, at=0),)
+    >>> remove = lambda c, item: c.remove(item)
+    >>> insert = lambda c, item, at: c.insert(at, item)
+    >>> next(iter_apply_diff_plan([1], plan, ['a'], [2], None, remove, insert, list))
+    Traceback (most recent call last):
+    ...
+    ValueError: plan has Update operations, but old_source or update is None
+    """
+    if not plan.operations:
+        return
+    if (
+        old_source is None or update is None
+    ) and CompactOperations.UPDATE in plan.operations.codes:
+        raise ValueError("plan has Update operations, but old_source or update is None")
+
+    # Create mapping from old keys to actual container items in the window
     old_key_to_item = {}
-    if old_source:
+    if plan.start < plan.stop:
         current_items = get_container_items(container)
-        for i, source_item in enumerate(old_source):
-            key = key_func(source_item)
-            if i < len(current_items):
-                old_key_to_item[key] = current_items[i]
+        for i in range(plan.start, min(plan.stop, len(current_items))):
+            old_key_to_item[old_keys[i]] = current_items[i]
 
-    def apply_operation(operation: Operation[KeyT]) -> None:
-        """Apply a single operation."""
+    def remove_all(container: ContainerT, items: Sequence[TargetT]) -> None:
+        for item in items:
+            remove(container, item)
 
-        match operation:
-            case Remove(key=key):
-                if key in old_key_to_item:
-                    target_item = old_key_to_item[key]
-                    remove(container, target_item)
+    def insert_all(container: ContainerT, items: Sequence[TargetT], at: int) -> None:
+        for offset, item in enumerate(items):
+            insert(container, item, at + offset)
 
-            case Insert(key=key, at=at):
-                source_item = new_key_to_item[key]
-                target_item = factory(source_item)
-                insert(container, target_item, at)
+    remove_items = remove_range or remove_all
+    insert_items = insert_range or insert_all
 
-            case Move(key=key, at=at):
-                if key in old_key_to_item:
-                    target_item = old_key_to_item[key]
-                    remove(container, target_item)
-                    insert(container, target_item, at)
+    def move_one(container: ContainerT, item: TargetT, at: int) -> None:
+        remove(container, item)
+        insert(container, item, at)
 
-    for op in compute_diff_operations(
-        old_key_to_index, new_key_to_index, new_source, key_func
-    ):
-        apply_operation(op)
+    def move_all(container: ContainerT, items: Sequence[TargetT], at: int) -> None:
+        remove_items(container, items)
+        insert_items(container, items, at)
+
+    move = move or move_one
+    move_range = move_range or move_all
+    clear = clear or remove_items
+
+    # Read the operations straight from their arrays, without creating an
+    # object for each of them
+    operations = plan.operations
+    codes, offsets, positions = (
+        operations.codes,
+        operations.offsets,
+        operations.positions,
+    )
+    sources, keys = operations.sources, operations.keys
+
+    for i, code in enumerate(codes):
+        first, stop = offsets[i], offsets[i + 1]
+        single = stop - first == 1
+        at = positions[i]
+
+        if code == CompactOperations.REMOVE:
+            if single:
+                if keys[first] in old_key_to_item:
+                    remove(container, old_key_to_item[keys[first]])
+            else:
+                remove_items(
+                    container,
+                    [
+                        old_key_to_item[k]
+                        for k in keys[first:stop]
+                        if k in old_key_to_item
+                    ],
+                )
+
+        elif code == CompactOperations.INSERT:
+            if single:
+                insert(container, factory(keys[first], new_source[at]), at)
+            else:
+                insert_items(
+                    container,
+                    [
+                        factory(key, item)
+                        for key, item in zip(
+                            keys[first:stop], new_source[at : at + stop - first]
+                        )
+                    ],
+                    at,
+                )
+
+        elif code == CompactOperations.MOVE:
+            if single:
+                if keys[first] in old_key_to_item:
+                    move(container, old_key_to_item[keys[first]], at)
+            else:
+                move_range(
+                    container,
+                    [
+                        old_key_to_item[k]
+                        for k in keys[first:stop]
+                        if k in old_key_to_item
+                    ],
+                    at,
+                )
+
+        elif code == CompactOperations.CLEAR:
+            clear(container, list(get_container_items(container)))
+
+        elif (
+            code == CompactOperations.UPDATE
+            and update is not None
+            and old_source is not None
+        ):
+            target_item = get_container_items(container)[at]
+            update(container, target_item, old_source[sources[i]], new_source[at])
+
+        yield
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from functools import singledispatch
 
 
@@ -31,3 +32,116 @@ def remove_widget(container, widget) -> None:
             ...
         """
     )
+
+
+@singledispatch
+def insert_widgets(container, widgets: Sequence, index: int) -> None:
+    """
+    Insert a contiguous run of widgets starting at a specific index.
+
+    Falls back to one `insert_widget` call per widget. Register an
+    implementation for containers that can insert a run more cheaply.
+    """
+    for offset, widget in enumerate(widgets):
+        insert_widget(container, widget, index + offset)
+
+
+@singledispatch
+def remove_widgets(container, widgets: Sequence) -> None:
+    """
+    Remove a run of widgets from container.
+
+    Falls back to one `remove_widget` call per widget. Register an
+    implementation for containers that can remove a run more cheaply.
+    """
+    for widget in widgets:
+        remove_widget(container, widget)
+
+
+@singledispatch
+def move_widget(container, widget, index: int) -> None:
+    """
+    Move a widget already in container so that it ends up at a specific index.
+
+    Falls back to `remove_widget` followed by `insert_widget`. Register an
+    implementation for containers that can reorder a child in place.
+    """
+    remove_widget(container, widget)
+    insert_widget(container, widget, index)
+
+
+@singledispatch
+def move_widgets(container, widgets: Sequence, index: int) -> None:
+    """
+    Move a run of widgets already in container so they sit contiguously
+    starting at a specific index.
+
+    Falls back to `remove_widgets` followed by `insert_widgets`. Register an
+    implementation for containers that can reorder children in place.
+    """
+    remove_widgets(container, widgets)
+    insert_widgets(container, widgets, index)
+
+
+@singledispatch
+def clear_container(container, widgets: Sequence) -> None:
+    """
+    Remove every widget from container, given all of its widgets in order.
+
+    Falls back to `remove_widgets`. Register an implementation for
+    containers that can drop all of their children at once.
+    """
+    remove_widgets(container, widgets)
+
+
+@singledispatch
+def insert_widget_after(container, widget, sibling) -> None:
+    """
+    Insert widget right after `sibling`, or first when `sibling` is None.
+
+    Optional: containers that place children relative to a sibling can
+    register this so callers that already know the neighbouring widget skip
+    the positional lookup of `insert_widget`.
+    """
+    container_t = type(container).__name__
+    raise NotImplementedError(f"insert_widget_after not implemented for {container_t}")
+
+
+@singledispatch
+def move_widget_after(container, widget, sibling) -> None:
+    """
+    Move a widget already in container right after `sibling`, or first when
+    `sibling` is None.
+
+    Optional: see `insert_widget_after`.
+    """
+    container_t = type(container).__name__
+    raise NotImplementedError(f"move_widget_after not implemented for {container_t}")
+
+
+@singledispatch
+def set_sort_key(container, key) -> None:
+    """
+    Make container keep its children sorted by `key(child)`.
+
+    Optional: containers that can sort their children natively register this
+    together with `sort_container`.
+    """
+    container_t = type(container).__name__
+    raise NotImplementedError(f"set_sort_key not implemented for {container_t}")
+
+
+@singledispatch
+def sort_container(container) -> None:
+    """
+    Sort the children of container again after their keys changed.
+
+    Optional: see `set_sort_key`.
+    """
+    container_t = type(container).__name__
+    raise NotImplementedError(f"sort_container not implemented for {container_t}")
+
+
+def has_implementation(dispatcher, container) -> bool:
+    """Check whether a dispatcher has an implementation registered for container."""
+    return dispatcher.dispatch(type(container)) is not dispatcher.dispatch(object)
@@ -0,0 +1,85 @@
+from collections import deque
+from collections.abc import Hashable, Iterable, Sequence
+
+
+class StructuralKey:
+    """
+    A key for an item by its value, for hashable items such as tuples and
+    frozen dataclasses.
+
+    The hash of the item is computed once, so looking keys up does not hash
+    every field again, and items are only compared when their hashes match.
+    Equal items are told apart by `occurrence`, their count among the equal
+    items before them.
+
+    >>> StructuralKey((1, 'a')) == StructuralKey((1, 'a'))
+    True
+    >>> StructuralKey((1, 'a')) == StructuralKey((1, 'a'), occurrence=1)
+    False
+    """
+
+    __slots__ = ("_hash", "item", "item_hash", "occurrence")
+
+    def __init__(
+        self, item: Hashable, occurrence: int = 0, item_hash: int | None = None
+    ) -> None:
+        self.item = item
+        self.occurrence = occurrence
+        self.item_hash = hash(item) if item_hash is None else item_hash
+        self._hash = (
+            self.item_hash if occurrence == 0 else hash((self.item_hash, occurrence))
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, StructuralKey)
+            and self._hash == other._hash
+            and self.occurrence == other.occurrence
+            and self.item_hash == other.item_hash
+            and (self.item is other.item or self.item == other.item)
+        )
+
+    def __repr__(self) -> str:
+        return f"StructuralKey({self.item!r}, occurrence={self.occurrence})"
+
+
+def structural_keys(
+    items: Sequence[Hashable], reuse: Iterable[StructuralKey] = ()
+) -> list[StructuralKey]:
+    """
+    Key every item by its value, numbering the occurrences of equal items.
+
+    Re-fetching equal items therefore yields equal keys, and a keyed diff of
+    them produces no operations. Keys in `reuse`, usually the keys of the
+    current items, are handed out again to equal items in their order, so
+    the numbering left behind by earlier edits is kept.
+
+    >>> structural_keys(['a', 'b', 'a'])
+    [StructuralKey('a', occurrence=0), StructuralKey('b', occurrence=0), StructuralKey('a', occurrence=1)]
+    >>> structural_keys(['a', 'a'], reuse=[StructuralKey('a', occurrence=3)])
+    [StructuralKey('a', occurrence=3), StructuralKey('a', occurrence=4)]
+    """
+    # Keys to hand out again and the next free occurrence, by item
+    reusable: dict[StructuralKey, deque[StructuralKey]] = {}
+    free: dict[StructuralKey, int] = {}
+    for key in reuse:
+        base = key if key.occurrence == 0 else StructuralKey(key.item, 0, key.item_hash)
+        reusable.setdefault(base, deque()).append(key)
+        free[base] = max(free.get(base, 0), key.occurrence + 1)
+
+    keys = []
+    for item in items:
+        key = StructuralKey(item)
+        queue = reusable.get(key)
+        if queue:
+            keys.append(queue.popleft())
+            continue
+        occurrence = free.get(key, 0)
+        free[key] = occurrence + 1
+        if occurrence:
+            key = StructuralKey(item, occurrence, key.item_hash)
+        keys.append(key)
+    return keys
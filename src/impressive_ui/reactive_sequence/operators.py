@@ -0,0 +1,253 @@
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+from itertools import count
+from typing import Any, Generic, Protocol, TypeVar
+
+from .splice import ListChange, MoveItem, Reset, Splice
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+class ListOperator(Protocol[T, U]):
+    def apply(self, change: ListChange[T]) -> list[ListChange[U]]:
+        """Translate a change of the source into changes of the derived list."""
+        ...
+
+
+class MapOperator(Generic[T, U]):
+    """
+    Translate changes of a sequence into changes of its mapped view.
+
+    Only the inserted items of a change are mapped.
+
+    >>> op = MapOperator(str.upper)
+    >>> op.apply(Reset(items=('a', 'b')))
+    [Reset(items=('A', 'B'))]
+    >>> op.apply(Splice(start=1, removed=0, inserted=('c',)))
+    [Splice(start=1, removed=0, inserted=('C',))]
+    """
+
+    def __init__(self, mapper: Callable[[T], U]) -> None:
+        self._mapper = mapper
+
+    def apply(self, change: ListChange[T]) -> list[ListChange[U]]:
+        mapper = self._mapper
+        match change:
+            case Reset(items=items):
+                return [Reset(items=tuple(map(mapper, items)))]
+            case Splice(start=start, removed=removed, inserted=inserted):
+                return [
+                    Splice(
+                        start=start,
+                        removed=removed,
+                        inserted=tuple(map(mapper, inserted)),
+                    )
+                ]
+            case MoveItem(source=source, target=target):
+                return [MoveItem(source=source, target=target)]
+
+
+class FilterOperator(Generic[T]):
+    """
+    Translate changes of a sequence into changes of its filtered view.
+
+    The predicate is only evaluated for inserted items. Whether each item
+    passes is kept in a bytearray, so the position of an item in the filtered
+    view is a single `bytearray.count` over the flags before it.
+
+    >>> op = FilterOperator(lambda x: x % 2 == 0)
+    >>> op.apply(Reset(items=(1, 2, 3, 4)))
+    [Reset(items=(2, 4))]
+    >>> op.apply(Splice(start=3, removed=0, inserted=(6, 7)))
+    [Splice(start=1, removed=0, inserted=(6,))]
+    >>> op.apply(Splice(start=0, removed=2, inserted=()))
+    [Splice(start=0, removed=1, inserted=())]
+    >>> op.set_predicate(lambda x: x > 3)
+    [Splice(start=1, removed=0, inserted=(7,))]
+    """
+
+    def __init__(self, predicate: Callable[[T], Any]) -> None:
+        self._predicate = predicate
+        self._items: list[T] = []
+        self._flags = bytearray()
+
+    def _evaluate(self, items: Sequence[T]) -> bytearray:
+        predicate = self._predicate
+        return bytearray(bool(predicate(item)) for item in items)
+
+    def _rank(self, index: int) -> int:
+        """
+        Count the items before `index` that pass the predicate.
+
+        This scans the flags in O(n), which `bytearray.count` does in C, and
+        is not an O(log n) lookup.
+        """
+        return self._flags.count(1, 0, index)
+
+    def apply(self, change: ListChange[T]) -> list[ListChange[T]]:
+        match change:
+            case Reset(items=items):
+                self._items = list(items)
+                self._flags = self._evaluate(self._items)
+                return [
+                    Reset(
+                        items=tuple(
+                            item for item, flag in zip(self._items, self._flags) if flag
+                        )
+                    )
+                ]
+
+            case Splice(start=start, removed=removed, inserted=inserted):
+                at = self._rank(start)
+                gone = self._flags.count(1, start, start + removed)
+                flags = self._evaluate(inserted)
+                self._items[start : start + removed] = inserted
+                self._flags[start : start + removed] = flags
+                kept = tuple(item for item, flag in zip(inserted, flags) if flag)
+                if not gone and not kept:
+                    return []
+                return [Splice(start=at, removed=gone, inserted=kept)]
+
+            case MoveItem(source=source, target=target):
+                flag = self._flags[source]
+                old_rank = self._rank(source)
+                self._items.insert(target, self._items.pop(source))
+                self._flags.insert(target, self._flags.pop(source))
+                if not flag:
+                    return []
+                new_rank = self._rank(target)
+                if old_rank == new_rank:
+                    return []
+                return [MoveItem(source=old_rank, target=new_rank)]
+
+    def set_predicate(self, predicate: Callable[[T], Any]) -> list[ListChange[T]]:
+        """
+        Replace the predicate and return the changes to the filtered view.
+
+        Each run of items that stopped or started passing becomes one splice.
+        """
+        self._predicate = predicate
+        flags = self._evaluate(self._items)
+        changes: list[ListChange[T]] = []
+        position = 0
+        start = None
+        removed = 0
+        inserted: list[T] = []
+
+        for item, old, new in zip(self._items, self._flags, flags):
+            if old == new:
+                if new:
+                    if start is not None:
+                        changes.append(
+                            Splice(
+                                start=start, removed=removed, inserted=tuple(inserted)
+                            )
+                        )
+                        position = start + len(inserted)
+                        start, removed, inserted = None, 0, []
+                    position += 1
+                continue
+            if start is None:
+                start = position
+            if old:
+                removed += 1
+            else:
+                inserted.append(item)
+
+        if start is not None:
+            changes.append(
+                Splice(start=start, removed=removed, inserted=tuple(inserted))
+            )
+
+        self._flags = flags
+        return changes
+
+
+class _Descending:
+    """Wrap a sort key so that it compares in reverse order."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
+
+class SortOperator(Generic[T]):
+    """
+    Translate changes of a sequence into changes of its sorted view.
+
+    Each item is placed by binary search on its sort key, so inserting or
+    removing an item costs O(log n) comparisons. Items with equal keys keep
+    the order in which they were added. A splice that touches more than half
+    of the list is re-sorted and emitted as a single `Reset`.
+
+    >>> op = SortOperator(len)
+    >>> op.apply(Reset(items=('ccc', 'a', 'bb')))
+    [Reset(items=('a', 'bb', 'ccc'))]
+    >>> op.apply(Splice(start=3, removed=0, inserted=('dd',)))
+    [Splice(start=2, removed=0, inserted=('dd',))]
+    >>> op.apply(Splice(start=1, removed=1, inserted=('eeee',)))
+    [Splice(start=0, removed=1, inserted=()), Splice(start=3, removed=0, inserted=('eeee',))]
+    """
+
+    def __init__(self, key: Callable[[T], Any], reverse: bool = False) -> None:
+        self._key = key
+        self._reverse = reverse
+        self._tokens = count()
+        self._items: list[T] = []
+        # Sort entries of the items in upstream order, and in sorted order
+        self._entries: list[tuple[Any, int]] = []
+        self._sorted: list[tuple[Any, int]] = []
+
+    def _entry(self, item: T) -> tuple[Any, int]:
+        key = self._key(item)
+        return (_Descending(key) if self._reverse else key, next(self._tokens))
+
+    def _reset(self) -> list[ListChange[T]]:
+        self._entries = [self._entry(item) for item in self._items]
+        order = sorted(range(len(self._entries)), key=self._entries.__getitem__)
+        self._sorted = [self._entries[i] for i in order]
+        return [Reset(items=tuple(self._items[i] for i in order))]
+
+    def apply(self, change: ListChange[T]) -> list[ListChange[T]]:
+        match change:
+            case Reset(items=items):
+                self._items = list(items)
+                return self._reset()
+
+            case Splice(start=start, removed=removed, inserted=inserted):
+                self._items[start : start + removed] = inserted
+                if 2 * (removed + len(inserted)) > len(self._items):
+                    return self._reset()
+
+                changes: list[ListChange[T]] = []
+                for entry in self._entries[start : start + removed]:
+                    at = bisect_left(self._sorted, entry)
+                    del self._sorted[at]
+                    changes.append(Splice(start=at, removed=1, inserted=()))
+
+                entries = [self._entry(item) for item in inserted]
+                self._entries[start : start + removed] = entries
+                for item, entry in zip(inserted, entries):
+                    at = bisect_left(self._sorted, entry)
+                    self._sorted.insert(at, entry)
+                    if changes and changes[-1] == Splice(
+                        start=at, removed=1, inserted=()
+                    ):
+                        # An item replaced in place keeps its row
+                        changes[-1] = Splice(start=at, removed=1, inserted=(item,))
+                    else:
+                        changes.append(Splice(start=at, removed=0, inserted=(item,)))
+                return changes
+
+            case MoveItem(source=source, target=target):
+                self._items.insert(target, self._items.pop(source))
+                self._entries.insert(target, self._entries.pop(source))
+                return []
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Splice(Generic[T]):
+    """Replace `removed` items starting at `start` with the `inserted` items."""
+
+    start: int
+    removed: int
+    inserted: tuple[T, ...]
+
+
+@dataclass(frozen=True)
+class MoveItem(Generic[T]):
+    """Move the item at `source` so that it ends up at `target`."""
+
+    source: int
+    target: int
+
+
+@dataclass(frozen=True)
+class Reset(Generic[T]):
+    """Replace the whole sequence with `items`."""
+
+    items: tuple[T, ...]
+
+
+ListChange = Splice[T] | MoveItem[T] | Reset[T]
+
+
+def apply_change(items: list[T], change: ListChange[T]) -> None:
+    """
+    Apply a change to a list in place.
+
+    >>> items = ['a', 'b', 'c']
+    >>> apply_change(items, Splice(start=1, removed=1, inserted=('x', 'y')))
+    >>> items
+    ['a', 'x', 'y', 'c']
+    >>> apply_change(items, MoveItem(source=0, target=3))
+    >>> items
+    ['x', 'y', 'c', 'a']
+    >>> apply_change(items, Reset(items=('z',)))
+    >>> items
+    ['z']
+    """
+    match change:
+        case Splice(start=start, removed=removed, inserted=inserted):
+            items[start : start + removed] = inserted
+        case MoveItem(source=source, target=target):
+            items.insert(target, items.pop(source))
+        case Reset(items=new_items):
+            items[:] = new_items
+
+
+def normalize_splice(length: int, start: int, removed: int) -> tuple[int, int]:
+    """
+    Clamp a splice to a sequence of `length` items, like slice assignment does.
+
+    Negative starts count from the end.
+
+    >>> normalize_splice(5, -2, 10)
+    (3, 2)
+    >>> normalize_splice(5, 7, 1)
+    (5, 0)
+    """
+    start = slice(start, None).indices(length)[0]
+    return start, max(0, min(removed, length - start))